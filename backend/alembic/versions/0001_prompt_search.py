@@ -0,0 +1,56 @@
+"""Prompt search: generated tsvector / trigram columns on jobs, GIN indexes
+
+Revision ID: 0001_prompt_search
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+The tables themselves still come from init_db.py. Databases it created
+before this revision have none of these objects and ones created after
+already have them, so every statement is idempotent and the revision
+applies cleanly to either.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_prompt_search"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Copies of app.models.job.SEARCH_TEXT_SQL / SEARCH_VECTOR_SQL at this revision
+SEARCH_TEXT_SQL = (
+    "coalesce(metadata_json->>'original_prompt', '') || ' ' "
+    "|| coalesce(prompt, '') || ' ' || coalesce(style_preset, '')"
+)
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(metadata_json->>'original_prompt', '')), 'A') "
+    "|| setweight(to_tsvector('simple', coalesce(prompt, '')), 'B') "
+    "|| setweight(to_tsvector('simple', coalesce(style_preset, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_text text "
+        f"GENERATED ALWAYS AS ({SEARCH_TEXT_SQL}) STORED NOT NULL"
+    )
+    op.execute(
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED NOT NULL"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING gin (search_vector)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_jobs_search_text_trgm ON jobs USING gin (search_text gin_trgm_ops)"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_videos_title_trgm ON videos USING gin (title gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_videos_title_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_jobs_search_text_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_jobs_search_vector")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS search_text")
@@ -0,0 +1,67 @@
+"""Media ingest / preview / HLS columns and keyset pagination indexes
+
+Revision ID: 0002_media_keyset
+Revises: 0001_prompt_search
+Create Date: 2026-10-18 12:00:00.000000
+
+Brings databases created by init_db.py before these columns and indexes
+existed up to the current models: probe results, content hash, mezzanine
+copy, gallery previews and HLS playlists on videos, the merged HLS
+playlist on stories, and the (user_id, sort key, id) indexes the list
+endpoints page over. Like 0001, every statement is idempotent, so it is a
+no-op on databases init_db.py created from the current models.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_media_keyset"
+down_revision: Union[str, None] = "0001_prompt_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VIDEO_COLUMNS = [
+    ("codec", "varchar(32)"),
+    ("fps", "double precision"),
+    ("has_audio", "boolean"),
+    ("keyframe_interval", "double precision"),
+    ("media_json", "json"),
+    ("content_hash", "varchar(64)"),
+    ("mezzanine_url", "text"),
+    ("mezzanine_media_json", "json"),
+    ("mezzanine_hash", "varchar(64)"),
+    ("poster_url", "text"),
+    ("sprite_url", "text"),
+    ("sprite_vtt_url", "text"),
+    ("preview_url", "text"),
+    ("hls_url", "text"),
+]
+STORY_COLUMNS = [
+    ("merged_hls_url", "text"),
+]
+INDEXES = [
+    ("ix_stories_user_created_id", "stories", "user_id, created_at, id"),
+    ("ix_jobs_user_created_id", "jobs", "user_id, created_at, id"),
+    ("ix_videos_user_created_id", "videos", "user_id, created_at, id"),
+    ("ix_videos_user_title_id", "videos", "user_id, title, id"),
+    ("ix_videos_user_file_size_id", "videos", "user_id, coalesce(file_size, 0), id"),
+]
+
+
+def upgrade() -> None:
+    for name, type_ in VIDEO_COLUMNS:
+        op.execute(f"ALTER TABLE videos ADD COLUMN IF NOT EXISTS {name} {type_}")
+    for name, type_ in STORY_COLUMNS:
+        op.execute(f"ALTER TABLE stories ADD COLUMN IF NOT EXISTS {name} {type_}")
+    for name, table, columns in INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def downgrade() -> None:
+    for name, _, _ in reversed(INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    for name, _ in reversed(STORY_COLUMNS):
+        op.execute(f"ALTER TABLE stories DROP COLUMN IF EXISTS {name}")
+    for name, _ in reversed(VIDEO_COLUMNS):
+        op.execute(f"ALTER TABLE videos DROP COLUMN IF EXISTS {name}")
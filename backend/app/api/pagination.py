@@ -0,0 +1,84 @@
+"""Keyset (cursor) pagination on ``(sort key, id)``.
+
+A cursor encodes the sort key of the last row of a page, so the next page is
+a range scan on an index instead of an OFFSET that re-reads every earlier
+row. The ``id`` tiebreaker keeps pages stable when sort keys collide.
+"""
+
+import base64
+import json
+import uuid
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+
+T = TypeVar("T")
+
+
+def encode_cursor(key: Any, row_id: uuid.UUID) -> str:
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    raw = json.dumps([key, str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, parse_key: Callable[[Any], Any] = datetime.fromisoformat
+) -> tuple[Any, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key, row_id = json.loads(raw)
+        return parse_key(key), uuid.UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def keyset_page(
+    query: Select,
+    sort_col: Any,
+    id_col: Any,
+    cursor: str | None,
+    limit: int,
+    descending: bool = True,
+    parse_key: Callable[[Any], Any] = datetime.fromisoformat,
+) -> Select:
+    """Restrict ``query`` to the page after ``cursor``, fetching one extra row.
+
+    The extra row only tells ``split_page`` whether another page exists.
+    ``parse_key`` turns the cursor's JSON sort key back into a column value.
+    """
+    if cursor:
+        key = tuple_(sort_col, id_col)
+        after = tuple_(*decode_cursor(cursor, parse_key))
+        query = query.where(key < after if descending else key > after)
+    if descending:
+        query = query.order_by(sort_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(sort_col.asc(), id_col.asc())
+    return query.limit(limit + 1)
+
+
+def _created_at_key(row: Any) -> tuple[Any, uuid.UUID]:
+    return row.created_at, row.id
+
+
+def split_page(
+    rows: Sequence[T],
+    limit: int,
+    cursor_key: Callable[[T], tuple[Any, uuid.UUID]] = _created_at_key,
+) -> tuple[list[T], str | None]:
+    """Trim the look-ahead row and return the page with the next cursor, if any.
+
+    ``cursor_key`` gives a row's (sort key, id), matching what ``keyset_page``
+    ordered by.
+    """
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    return page, encode_cursor(*cursor_key(page[-1]))
@@ -13,8 +13,8 @@ from app.models.character import Character
 from app.models.creative_session import CreativeSession
 from app.models.job import Job
 from app.models.story import Scene, Story
-from app.models.user import User, UserApiKey
-from app.security import decrypt_api_key
+from app.models.user import User
+from app.services import credentials, list_counts
 from app.services.creative.director import creative_chat, extract_storyboard_json
 from app.services.generation.prompt_enhancer import enhance_story_scene_prompt
 
@@ -49,19 +49,13 @@ class ConfirmRequest(BaseModel):
 
 async def _get_zhipu_key(db: AsyncSession, user_id: uuid.UUID) -> str:
     """Retrieve and decrypt the user's ZhiPu API key (stored under cogvideo provider)."""
-    result = await db.execute(
-        select(UserApiKey).where(
-            UserApiKey.user_id == user_id,
-            UserApiKey.provider == "cogvideo",
-        )
-    )
-    record = result.scalar_one_or_none()
-    if record is None:
+    api_key = await credentials.get_api_key(db, user_id, "cogvideo")
+    if api_key is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="AI 创意总监需要智谱 API Key（与 CogVideo 共用）。请在 Settings 页面添加 CogVideo API Key。",
         )
-    return decrypt_api_key(record.encrypted_key)
+    return api_key
 
 
 async def _get_session(
@@ -262,12 +256,13 @@ async def confirm_and_generate(
             },
         )
         db.add(job)
-        await db.flush()
+        session.status = "generating"
+        await db.commit()
+        await list_counts.invalidate(current_user.id, list_counts.JOBS)
 
         from app.tasks.generation_tasks import process_generation
         process_generation.delay(str(job.id))
 
-        session.status = "generating"
         return {
             "mode": "single",
             "job_id": str(job.id),
@@ -358,14 +353,16 @@ async def confirm_and_generate(
 
         session.story_id = story.id
         session.status = "generating"
+        await db.commit()
+        await list_counts.invalidate(current_user.id, list_counts.JOBS)
 
+        from app.tasks.story_runner import start_story_run
         if is_coherent:
             from app.tasks.generation_tasks import process_story_generation_chained
+            await start_story_run(str(story.id), str(current_user.id), scene_job_ids, dispatch=False)
             process_story_generation_chained.delay(str(story.id), scene_job_ids)
         else:
-            from app.tasks.generation_tasks import process_generation
-            for jid in scene_job_ids:
-                process_generation.delay(jid)
+            await start_story_run(str(story.id), str(current_user.id), scene_job_ids)
 
         return {
             "mode": "story",
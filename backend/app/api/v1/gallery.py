@@ -1,59 +1,97 @@
 import uuid
+from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, literal_column, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.pagination import keyset_page, split_page
 from app.database import get_db
 from app.deps import get_current_user
 from app.models.job import Job
 from app.models.user import User
 from app.models.video import Video
 from app.schemas.gallery import GalleryListResponse, VideoResponse
+from app.services import list_counts
+from app.services import search as search_service
 
 router = APIRouter()
 
 
+# sort_by -> (sort expression, cursor key parser). file_size sorts NULL as 0
+# so the keyset comparison stays total; the literal 0 keeps the expression
+# identical to ix_videos_user_file_size_id's
+_SORT_KEYS = {
+    "created_at": (Video.created_at, datetime.fromisoformat),
+    "title": (Video.title, str),
+    "file_size": (func.coalesce(Video.file_size, literal_column("0")), int),
+}
+
+
 @router.get("", response_model=GalleryListResponse)
 async def list_gallery(
-    page: int = Query(1, ge=1),
+    cursor: str | None = Query(None),
     page_size: int = Query(20, ge=1, le=100),
     job_type: str | None = Query(None),
-    search: str | None = Query(None),
-    sort_by: str = Query("created_at", pattern=r"^(created_at|title|file_size)$"),
+    search: str | None = Query(None, min_length=1, max_length=200),
+    sort_by: str | None = Query(None, pattern=r"^(relevance|created_at|title|file_size)$"),
     sort_order: str = Query("desc", pattern=r"^(asc|desc)$"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> GalleryListResponse:
+    """One page of the gallery; pass ``next_cursor`` back as ``cursor`` for the next.
+
+    ``search`` matches titles and the prompts and style of each video's job,
+    and results default to relevance order with highlighted prompts.
+    """
     base_query = select(Video).where(Video.user_id == current_user.id)
     count_query = select(func.count()).select_from(Video).where(Video.user_id == current_user.id)
 
-    if job_type:
-        base_query = base_query.join(Job, Video.job_id == Job.id).where(Job.job_type == job_type)
-        count_query = count_query.join(Job, Video.job_id == Job.id).where(Job.job_type == job_type)
-
     if search:
-        search_filter = Video.title.ilike(f"%{search}%")
+        # Candidates come from index-backed id lookups; ranking and paging
+        # only touch those rows
+        search_filter = Video.id.in_(search_service.matching_video_ids(search, current_user.id))
         base_query = base_query.where(search_filter)
         count_query = count_query.where(search_filter)
+    if job_type or search:
+        # The job supplies the job_type filter and the relevance rank
+        base_query = base_query.outerjoin(Job, Video.job_id == Job.id)
+    if job_type:
+        base_query = base_query.where(Job.job_type == job_type)
+        count_query = count_query.join(Job, Video.job_id == Job.id).where(Job.job_type == job_type)
 
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Sort
-    sort_column = getattr(Video, sort_by)
-    order = sort_column.desc() if sort_order == "desc" else sort_column.asc()
+    total = await list_counts.cached_count(
+        db, list_counts.VIDEOS, current_user.id,
+        {"job_type": job_type, "search": search}, count_query,
+    )
 
-    offset = (page - 1) * page_size
-    query = base_query.order_by(order).offset(offset).limit(page_size)
+    sort_by = sort_by or ("relevance" if search else "created_at")
+    if sort_by == "relevance" and search:
+        sort_col, parse_key = search_service.video_rank(search), float
+    else:
+        sort_col, parse_key = _SORT_KEYS.get(sort_by, _SORT_KEYS["created_at"])
+    query = keyset_page(
+        base_query.add_columns(sort_col.label("sort_key")), sort_col, Video.id, cursor, page_size,
+        descending=sort_order == "desc", parse_key=parse_key,
+    )
     result = await db.execute(query)
-    videos = result.scalars().all()
+    rows, next_cursor = split_page(result.all(), page_size, lambda row: (row.sort_key, row.Video.id))
+    videos = [row.Video for row in rows]
+
+    highlights = {}
+    if search:
+        highlights = await search_service.job_highlights(
+            db, [v.job_id for v in videos if v.job_id], search
+        )
 
     return GalleryListResponse(
-        items=[VideoResponse.model_validate(v) for v in videos],
+        items=[
+            VideoResponse.model_validate(v).model_copy(update={"highlight": highlights.get(v.job_id)})
+            for v in videos
+        ],
         total=total,
-        page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
     )
 
 
@@ -111,3 +149,5 @@ async def delete_video(
         pass  # Best effort deletion from storage
 
     await db.delete(video)
+    await db.commit()
+    await list_counts.invalidate(current_user.id, list_counts.VIDEOS)
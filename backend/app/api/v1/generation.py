@@ -8,7 +8,7 @@ from app.database import get_db
 from app.deps import get_current_user
 from app.models.job import Job
 from app.models.story import Scene, Story
-from app.models.user import User, UserApiKey
+from app.models.user import User
 from app.schemas.generation import (
     GenerationResponse,
     ImageToVideoRequest,
@@ -16,6 +16,7 @@ from app.schemas.generation import (
     TextToVideoRequest,
     VideoToAnimeRequest,
 )
+from app.services import credentials, list_counts
 from app.services.generation.prompt_enhancer import enhance_prompt, enhance_story_scene_prompt, get_negative_prompt
 from app.tasks.generation_tasks import process_generation, process_story_generation
 
@@ -28,13 +29,7 @@ async def _validate_provider_key(
     """Ensure the user has an API key for the given provider (except comfyui)."""
     if provider == "comfyui":
         return
-    result = await db.execute(
-        select(UserApiKey).where(
-            UserApiKey.user_id == user_id,
-            UserApiKey.provider == provider,
-        )
-    )
-    if result.scalar_one_or_none() is None:
+    if provider not in await credentials.configured_providers(db, user_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"No API key configured for provider: {provider}. "
@@ -70,7 +65,8 @@ async def image_to_video(
         },
     )
     db.add(job)
-    await db.flush()
+    await db.commit()
+    await list_counts.invalidate(current_user.id, list_counts.JOBS)
 
     process_generation.delay(str(job.id))
 
@@ -107,7 +103,8 @@ async def text_to_video(
         },
     )
     db.add(job)
-    await db.flush()
+    await db.commit()
+    await list_counts.invalidate(current_user.id, list_counts.JOBS)
 
     process_generation.delay(str(job.id))
 
@@ -141,7 +138,8 @@ async def video_to_anime(
         },
     )
     db.add(job)
-    await db.flush()
+    await db.commit()
+    await list_counts.invalidate(current_user.id, list_counts.JOBS)
 
     process_generation.delay(str(job.id))
 
@@ -246,7 +244,8 @@ async def generate_story(
         scene.status = "queued"
         scene_job_ids.append(str(scene_job.id))
 
-    await db.flush()
+    await db.commit()
+    await list_counts.invalidate(current_user.id, list_counts.JOBS)
 
     process_story_generation.delay(str(parent_job.id), scene_job_ids)
 
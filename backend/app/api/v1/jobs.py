@@ -4,24 +4,34 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.pagination import keyset_page, split_page
 from app.database import get_db
 from app.deps import get_current_user
 from app.models.job import Job
 from app.models.user import User
 from app.schemas.job import JobListResponse, JobResponse
+from app.services import list_counts
+from app.services import search as search_service
+from app.tasks.story_runner import on_scene_finished
 
 router = APIRouter()
 
 
 @router.get("", response_model=JobListResponse)
 async def list_jobs(
-    page: int = Query(1, ge=1),
+    cursor: str | None = Query(None),
     page_size: int = Query(20, ge=1, le=100),
     status_filter: str | None = Query(None, alias="status"),
     job_type: str | None = Query(None),
+    search: str | None = Query(None, min_length=1, max_length=200),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> JobListResponse:
+    """One page of jobs; pass ``next_cursor`` back as ``cursor`` for the next.
+
+    Jobs come newest first, or most relevant first with highlighted prompts
+    when ``search`` matches against prompts and style.
+    """
     base_query = select(Job).where(Job.user_id == current_user.id)
     count_query = select(func.count()).select_from(Job).where(Job.user_id == current_user.id)
 
@@ -33,21 +43,39 @@ async def list_jobs(
         base_query = base_query.where(Job.job_type == job_type)
         count_query = count_query.where(Job.job_type == job_type)
 
-    # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    if search:
+        search_filter = search_service.job_match(search)
+        base_query = base_query.where(search_filter)
+        count_query = count_query.where(search_filter)
+
+    total = await list_counts.cached_count(
+        db, list_counts.JOBS, current_user.id,
+        {"status": status_filter, "job_type": job_type, "search": search}, count_query,
+    )
 
-    # Get paginated results
-    offset = (page - 1) * page_size
-    query = base_query.order_by(Job.created_at.desc()).offset(offset).limit(page_size)
-    result = await db.execute(query)
-    jobs = result.scalars().all()
+    if search:
+        rank = search_service.job_rank(search)
+        query = keyset_page(
+            base_query.add_columns(rank.label("rank")), rank, Job.id, cursor, page_size,
+            parse_key=float,
+        )
+        result = await db.execute(query)
+        rows, next_cursor = split_page(result.all(), page_size, lambda row: (row.rank, row.Job.id))
+        jobs = [row.Job for row in rows]
+        highlights = await search_service.job_highlights(db, [j.id for j in jobs], search)
+    else:
+        result = await db.execute(keyset_page(base_query, Job.created_at, Job.id, cursor, page_size))
+        jobs, next_cursor = split_page(result.scalars().all(), page_size)
+        highlights = {}
 
     return JobListResponse(
-        items=[JobResponse.model_validate(j) for j in jobs],
+        items=[
+            JobResponse.model_validate(j).model_copy(update={"highlight": highlights.get(j.id)})
+            for j in jobs
+        ],
         total=total,
-        page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
     )
 
 
@@ -91,3 +119,8 @@ async def delete_job(
         job.error_message = "Cancelled by user"
     else:
         await db.delete(job)
+    await db.commit()
+    # Count a story scene as failed so its run still advances and merges
+    await on_scene_finished(job, succeeded=False)
+    # Also drops gallery totals filtered by job_type, which join on the job
+    await list_counts.invalidate(current_user.id, list_counts.JOBS, list_counts.VIDEOS)
@@ -7,6 +7,7 @@ from app.deps import get_current_user
 from app.models.user import User, UserApiKey
 from app.schemas.settings import ApiKeyCreate, ApiKeyListResponse, ApiKeyResponse
 from app.security import encrypt_api_key
+from app.services import credentials
 
 router = APIRouter()
 
@@ -62,7 +63,8 @@ async def save_api_key(
         encrypted_key=encrypted,
     )
     db.add(api_key_record)
-    await db.flush()
+    await db.commit()
+    await credentials.invalidate(current_user.id)
 
     return ApiKeyResponse(
         provider=api_key_record.provider,
@@ -97,3 +99,5 @@ async def delete_api_key(
         )
 
     await db.delete(key)
+    await db.commit()
+    await credentials.invalidate(current_user.id)
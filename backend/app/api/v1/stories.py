@@ -1,49 +1,83 @@
 import uuid
+from collections import defaultdict
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import delete, select
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.api.pagination import keyset_page, split_page
 from app.database import get_db
 from app.deps import get_current_user
 from app.models import Character, Scene, Story
 from app.models.user import User
 from app.schemas.generation import StoryGenerationRequest
+from app.services import list_counts
 from app.tasks.generation_tasks import (
-    merge_story,
-    process_generation,
     process_story_generation,
     process_story_generation_chained,
 )
+from app.tasks.media_tasks import merge_story
+from app.tasks.story_runner import start_story_run
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[dict])
+async def _scene_status_counts(
+    db: AsyncSession, story_ids: list[uuid.UUID]
+) -> dict[uuid.UUID, dict[str, int]]:
+    """Scene status histogram per story, from one grouped query."""
+    if not story_ids:
+        return {}
+    result = await db.execute(
+        select(Scene.story_id, Scene.status, func.count())
+        .where(Scene.story_id.in_(story_ids))
+        .group_by(Scene.story_id, Scene.status)
+    )
+    counts: dict[uuid.UUID, dict[str, int]] = defaultdict(dict)
+    for story_id, scene_status, count in result.all():
+        counts[story_id][scene_status] = count
+    return counts
+
+
+@router.get("", response_model=dict)
 async def list_stories(
+    cursor: str | None = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    summary: bool = Query(False),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> list[dict]:
-    result = await db.execute(
-        select(Story).where(Story.user_id == current_user.id).order_by(Story.created_at.desc())
-    )
-    stories = result.scalars().all()
+) -> dict:
+    """List stories newest first, a page at a time.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` for the next page.
+    With ``summary``, stories carry scene counts and a status histogram
+    instead of their scenes.
+    """
+    query = select(Story).where(Story.user_id == current_user.id)
+    if not summary:
+        query = query.options(selectinload(Story.scenes))
+    result = await db.execute(keyset_page(query, Story.created_at, Story.id, cursor, limit))
+    stories, next_cursor = split_page(result.scalars().all(), limit)
+
+    status_counts = await _scene_status_counts(db, [s.id for s in stories]) if summary else {}
 
     output = []
     for story in stories:
-        scenes_result = await db.execute(
-            select(Scene).where(Scene.story_id == story.id).order_by(Scene.order_index)
-        )
-        scenes = scenes_result.scalars().all()
-
         story_data = {
             "id": str(story.id),
             "title": story.title,
             "description": story.description,
+            "merged_status": story.merged_status,
             "created_at": story.created_at.isoformat() if story.created_at else None,
             "updated_at": story.updated_at.isoformat() if story.updated_at else None,
-            "scenes": [
+        }
+        if summary:
+            counts = status_counts.get(story.id, {})
+            story_data["scene_count"] = sum(counts.values())
+            story_data["scene_status_counts"] = counts
+        else:
+            story_data["scenes"] = [
                 {
                     "id": str(scene.id),
                     "order_index": scene.order_index,
@@ -52,12 +86,11 @@ async def list_stories(
                     "status": scene.status,
                     "job_id": str(scene.job_id) if scene.job_id else None,
                 }
-                for scene in scenes
-            ],
-        }
+                for scene in story.scenes
+            ]
         output.append(story_data)
 
-    return output
+    return {"items": output, "next_cursor": next_cursor}
 
 
 @router.get("/{story_id}", response_model=dict)
@@ -94,6 +127,9 @@ async def get_story(
         "id": str(story.id),
         "title": story.title,
         "description": story.description,
+        "merged_status": story.merged_status,
+        "merged_video_url": story.merged_video_url,
+        "merged_hls_url": story.merged_hls_url,
         "created_at": story.created_at.isoformat() if story.created_at else None,
         "updated_at": story.updated_at.isoformat() if story.updated_at else None,
         "scenes": [
@@ -419,15 +455,16 @@ async def generate_story(
         scene_job_ids.append(str(scene_job.id))
 
     await db.commit()
+    await list_counts.invalidate(current_user.id, list_counts.JOBS)
 
-    # Dispatch based on generation mode
+    # Dispatch based on generation mode; the story run merges once all scenes finish
     if is_coherent:
         # Coherent mode: chained I2V generation (sequential)
+        await start_story_run(str(story.id), str(current_user.id), scene_job_ids, dispatch=False)
         process_story_generation_chained.delay(str(story.id), scene_job_ids)
     else:
-        # Fast mode: parallel generation
-        for scene_job_id in scene_job_ids:
-            process_generation.delay(scene_job_id)
+        # Fast mode: parallel generation, up to STORY_MAX_CONCURRENT_SCENES at a time
+        await start_story_run(str(story.id), str(current_user.id), scene_job_ids)
 
     mode_label = "coherent (chained)" if is_coherent else "fast (parallel)"
     return {
@@ -488,6 +525,7 @@ async def merge_story_videos(
     # Reset merge status
     story.merged_status = "not_started"
     story.merged_video_url = None
+    story.merged_hls_url = None
     await db.commit()
 
     # Trigger merge task
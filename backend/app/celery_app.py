@@ -19,8 +19,12 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,
     task_routes={
         "app.tasks.generation_tasks.*": {"queue": "generation"},
+        "app.tasks.media_tasks.*": {"queue": "media"},
     },
     task_default_queue="default",
 )
 
+# Generation tasks are I/O-bound and run on thread-pool workers; media tasks
+# run ffmpeg and get prefork workers sized to the cores (see docker-compose.yml)
 celery_app.autodiscover_tasks(["app.tasks"], related_name="generation_tasks")
+celery_app.autodiscover_tasks(["app.tasks"], related_name="media_tasks")
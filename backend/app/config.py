@@ -25,8 +25,83 @@ class Settings(BaseSettings):
         scheme = "https" if self.MINIO_SECURE else "http"
         return f"{scheme}://{endpoint}"
     COMFYUI_URL: str = "http://localhost:8188"
+    COMFYUI_EVENTS_ENABLED: bool = True
     DEBUG: bool = False
 
+    # Per-process DB pool used by Celery workers (see app.tasks.worker_runtime);
+    # 0 sizes it to the worker's thread concurrency
+    WORKER_DB_POOL_SIZE: int = 0
+    WORKER_DB_MAX_OVERFLOW: int = 5
+
+    # Shared provider HTTP clients (one pool per provider base URL)
+    PROVIDER_HTTP2: bool = True
+    PROVIDER_HTTP_MAX_CONNECTIONS: int = 100
+    PROVIDER_HTTP_MAX_KEEPALIVE: int = 20
+    PROVIDER_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    PROVIDER_HTTP_TIMEOUT: float = 60.0
+    PROVIDER_HTTP_CONNECT_TIMEOUT: float = 10.0
+
+    # Token-bucket limits per provider and API key, shared through Redis:
+    # sustained requests/second and burst size. Unlisted providers are unlimited.
+    PROVIDER_RATE_LIMITS: dict[str, float] = {
+        "kling": 1.0,
+        "jimeng": 2.0,
+        "vidu": 1.0,
+        "cogvideo": 0.5,
+    }
+    PROVIDER_RATE_BURST: dict[str, int] = {
+        "kling": 5,
+        "jimeng": 10,
+        "vidu": 5,
+        "cogvideo": 3,
+    }
+
+    # Scene jobs of one fast-mode story generating at the same time
+    STORY_MAX_CONCURRENT_SCENES: int = 4
+
+    # Ingest-time conforming of scene videos to one mezzanine profile, so
+    # merges can stream-copy them. Keyframes every MEZZANINE_KEYFRAME_SECONDS
+    # (matching the 0.5 s merge crossfade) let bodies be cut at the fades.
+    MEZZANINE_ENABLED: bool = False
+    MEZZANINE_FPS: int = 24
+    MEZZANINE_SHORT_SIDE: int = 720
+    MEZZANINE_KEYFRAME_SECONDS: float = 0.5
+    MEZZANINE_CRF: int = 20
+    MEZZANINE_PRESET: str = "medium"
+
+    # ffmpeg / ffprobe processes per worker loop (0 = one per core) and the
+    # time any single run may take
+    MEDIA_TOOL_CONCURRENCY: int = 0
+    MEDIA_TOOL_TIMEOUT_SECONDS: float = 900.0
+
+    # Poster, seek sprite sheet + WebVTT and hover preview, generated in one
+    # decode at ingest; the poster also serves as the thumbnail
+    PREVIEWS_ENABLED: bool = True
+
+    # Optional HLS (fMP4) ladder packaged next to each video and merged story,
+    # one rendition per height up to the source's own
+    HLS_ENABLED: bool = False
+    HLS_SEGMENT_SECONDS: int = 4
+    HLS_RENDITION_HEIGHTS: list[int] = [720, 480, 360]
+
+    # Story merges: concurrent ffmpeg processes (0 = one per core) and chunk
+    # length when scenes must be re-encoded before they can be merged
+    MERGE_WORKERS: int = 0
+    MERGE_CHUNK_SECONDS: float = 4.0
+
+    # Cached gallery / job list totals expire after this long, bounding how
+    # stale a status-filtered total can get (inserts and deletes invalidate)
+    LIST_COUNT_TTL_SECONDS: int = 300
+
+    # Authenticated users cached per API process (0 = no cache); changes
+    # are pushed to every process over Redis, the TTL is a backstop
+    USER_CACHE_TTL_SECONDS: float = 60.0
+    USER_CACHE_MAX_ENTRIES: int = 10000
+
+    # Provider key lookups / decrypted keys cached per process (0 = no cache);
+    # saving or deleting a key invalidates them everywhere at once
+    CREDENTIAL_CACHE_TTL_SECONDS: float = 300.0
+
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
     ALGORITHM: str = "HS256"
 
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models.user import User
 from app.security import decode_access_token
+from app.services import user_cache
 
 bearer_scheme = HTTPBearer()
 
@@ -41,6 +42,12 @@ async def get_current_user(
             detail="Invalid token payload",
         )
 
+    # Most requests are served from the cache and make no auth query
+    iat = payload.get("iat")
+    user = user_cache.get(user_id_str, iat)
+    if user is not None:
+        return user
+
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
 
@@ -50,4 +57,5 @@ async def get_current_user(
             detail="User not found",
         )
 
+    user_cache.put(user_id_str, iat, user)
     return user
@@ -7,6 +7,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import api_router
 from app.config import settings
+from app.services import user_cache
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +26,13 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     except Exception as exc:
         logger.warning("Could not connect to MinIO on startup: %s", exc)
 
+    user_cache.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down anime-video-gen backend...")
+    await user_cache.stop()
 
 
 app = FastAPI(
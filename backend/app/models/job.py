@@ -1,15 +1,38 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSON, UUID
+from sqlalchemy import Computed, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSON, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base
 
 
+# Text searched by app.services.search: the prompt as the user wrote it,
+# the enhanced prompt sent to the provider, and the style preset. The
+# migration in alembic/versions carries a copy of both expressions.
+SEARCH_TEXT_SQL = (
+    "coalesce(metadata_json->>'original_prompt', '') || ' ' "
+    "|| coalesce(prompt, '') || ' ' || coalesce(style_preset, '')"
+)
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(metadata_json->>'original_prompt', '')), 'A') "
+    "|| setweight(to_tsvector('simple', coalesce(prompt, '')), 'B') "
+    "|| setweight(to_tsvector('simple', coalesce(style_preset, '')), 'C')"
+)
+
+
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Keyset pagination of a user's jobs on (created_at, id)
+        Index("ix_jobs_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_jobs_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_jobs_search_text_trgm", "search_text",
+            postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -35,6 +58,11 @@ class Job(Base):
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     progress: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     metadata_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # Maintained by Postgres; deferred so listings don't load them
+    search_text: Mapped[str] = mapped_column(Text, Computed(SEARCH_TEXT_SQL, persisted=True), deferred=True)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True), deferred=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
     )
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -12,6 +12,8 @@ from app.models import Base
 
 class Story(Base):
     __tablename__ = "stories"
+    # Keyset pagination of a user's stories on (created_at, id)
+    __table_args__ = (Index("ix_stories_user_created_id", "user_id", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -22,6 +24,7 @@ class Story(Base):
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     merged_video_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    merged_hls_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     merged_status: Mapped[str] = mapped_column(
         String(20), nullable=False, default="not_started"
     )  # not_started, merging, completed, failed
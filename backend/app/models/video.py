@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base
@@ -10,6 +10,17 @@ from app.models import Base
 
 class Video(Base):
     __tablename__ = "videos"
+    # Keyset pagination of a user's gallery for each sort_by option
+    __table_args__ = (
+        Index("ix_videos_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_videos_user_title_id", "user_id", "title", "id"),
+        Index("ix_videos_user_file_size_id", "user_id", text("coalesce(file_size, 0)"), "id"),
+        # Partial / CJK title matches (app.services.search)
+        Index(
+            "ix_videos_title_trgm", "title",
+            postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -30,6 +41,26 @@ class Video(Base):
     width: Mapped[int | None] = mapped_column(Integer, nullable=True)
     height: Mapped[int | None] = mapped_column(Integer, nullable=True)
     file_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Probed once at ingest (app.services.media.probe); null for unprobed videos
+    codec: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    fps: Mapped[float | None] = mapped_column(Float, nullable=True)
+    has_audio: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    keyframe_interval: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Full probe result, keyframes included; deferred, undefer where it's read
+    media_json: Mapped[dict | None] = mapped_column(JSON, nullable=True, deferred=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Copy conformed to the mezzanine profile (app.services.media.mezzanine);
+    # ``url`` keeps the provider original
+    mezzanine_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    mezzanine_media_json: Mapped[dict | None] = mapped_column(JSON, nullable=True, deferred=True)
+    mezzanine_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Gallery previews (app.services.media.preview), uploaded together at ingest
+    poster_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sprite_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sprite_vtt_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    preview_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Master playlist of the HLS ladder (app.services.media.hls), if packaged
+    hls_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
     )
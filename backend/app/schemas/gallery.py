@@ -11,11 +11,21 @@ class VideoResponse(BaseModel):
     title: str
     url: str
     thumbnail_url: str | None = None
+    poster_url: str | None = None
+    sprite_url: str | None = None
+    sprite_vtt_url: str | None = None
+    preview_url: str | None = None
+    hls_url: str | None = None
     duration: float | None = None
     width: int | None = None
     height: int | None = None
+    codec: str | None = None
+    fps: float | None = None
+    has_audio: bool | None = None
     file_size: int | None = None
     created_at: datetime
+    # Search results only: the job's prompt with matched words in <mark>
+    highlight: str | None = None
 
     model_config = {"from_attributes": True}
 
@@ -23,5 +33,5 @@ class VideoResponse(BaseModel):
 class GalleryListResponse(BaseModel):
     items: list[VideoResponse]
     total: int
-    page: int
     page_size: int
+    next_cursor: str | None = None
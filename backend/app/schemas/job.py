@@ -21,6 +21,8 @@ class JobResponse(BaseModel):
     metadata_json: dict | None = None
     created_at: datetime
     updated_at: datetime
+    # Search results only: the prompt with matched words in <mark>
+    highlight: str | None = None
 
     model_config = {"from_attributes": True}
 
@@ -28,5 +30,5 @@ class JobResponse(BaseModel):
 class JobListResponse(BaseModel):
     items: list[JobResponse]
     total: int
-    page: int
     page_size: int
+    next_cursor: str | None = None
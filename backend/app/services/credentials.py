@@ -0,0 +1,117 @@
+"""Cached resolution of users' provider API keys.
+
+Two per-process caches, each entry living CREDENTIAL_CACHE_TTL_SECONDS:
+which providers a user has keys for (request validation), and decrypted
+keys (workers, the poller and the creative chat). Decrypted keys stay in
+process memory and are never written to Redis.
+
+Redis holds only a per-user version number. ``invalidate`` bumps it after a
+key is saved or deleted, and every lookup checks it, so no process serves a
+replaced or deleted key, with no listener to keep alive. If Redis is
+unreachable the lookup goes to the database.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any
+
+import redis.asyncio as aioredis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.user import UserApiKey
+from app.security import decrypt_api_key
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY_PREFIX = "credentials:version"
+
+# key -> (user's credential version, expiry on the monotonic clock, value)
+_providers: dict[uuid.UUID, tuple[str, float, frozenset[str]]] = {}
+_keys: dict[tuple[uuid.UUID, str], tuple[str, float, str | None]] = {}
+
+_redis: tuple[asyncio.AbstractEventLoop, aioredis.Redis] | None = None
+
+
+def _get_redis() -> aioredis.Redis:
+    global _redis
+    loop = asyncio.get_running_loop()
+    if _redis is None or _redis[0] is not loop:
+        _redis = (loop, aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True))
+    return _redis[1]
+
+
+async def _version(user_id: uuid.UUID) -> str | None:
+    """The user's current credential version, or None if it can't be read."""
+    try:
+        return await _get_redis().get(f"{VERSION_KEY_PREFIX}:{user_id}") or "0"
+    except aioredis.RedisError as e:
+        logger.warning("Credential version lookup failed, bypassing cache: %s", e)
+        return None
+
+
+def _cached(cache: dict, key: Any, version: str | None) -> tuple[bool, Any]:
+    entry = cache.get(key)
+    if entry is None or version is None:
+        return False, None
+    entry_version, expires_at, value = entry
+    if entry_version != version or expires_at < time.monotonic():
+        del cache[key]
+        return False, None
+    return True, value
+
+
+def _store(cache: dict, key: Any, version: str | None, value: Any) -> None:
+    if version is not None and settings.CREDENTIAL_CACHE_TTL_SECONDS > 0:
+        cache[key] = (version, time.monotonic() + settings.CREDENTIAL_CACHE_TTL_SECONDS, value)
+
+
+async def configured_providers(db: AsyncSession, user_id: uuid.UUID) -> frozenset[str]:
+    """Providers the user has stored an API key for."""
+    version = await _version(user_id)
+    hit, providers = _cached(_providers, user_id, version)
+    if hit:
+        return providers
+    result = await db.execute(select(UserApiKey.provider).where(UserApiKey.user_id == user_id))
+    providers = frozenset(result.scalars().all())
+    _store(_providers, user_id, version, providers)
+    return providers
+
+
+async def get_api_key(db: AsyncSession, user_id: uuid.UUID, provider: str) -> str | None:
+    """The user's decrypted API key for ``provider``, or None if none is stored."""
+    version = await _version(user_id)
+    hit, api_key = _cached(_keys, (user_id, provider), version)
+    if hit:
+        return api_key
+    result = await db.execute(
+        select(UserApiKey.encrypted_key).where(
+            UserApiKey.user_id == user_id,
+            UserApiKey.provider == provider,
+        )
+    )
+    encrypted = result.scalar_one_or_none()
+    api_key = decrypt_api_key(encrypted) if encrypted is not None else None
+    _store(_keys, (user_id, provider), version, api_key)
+    return api_key
+
+
+async def invalidate(user_id: uuid.UUID) -> None:
+    """Call after committing a change to the user's keys; applies to every process."""
+    _providers.pop(user_id, None)
+    for key in [key for key in _keys if key[0] == user_id]:
+        del _keys[key]
+    try:
+        await _get_redis().incr(f"{VERSION_KEY_PREFIX}:{user_id}")
+    except aioredis.RedisError as e:
+        logger.error("Credential invalidation for user %s failed: %s", user_id, e)
+
+
+async def close_credentials() -> None:
+    global _redis
+    if _redis is not None and _redis[0] is asyncio.get_running_loop():
+        await _redis[1].aclose()
+        _redis = None
@@ -1,7 +1,21 @@
+import asyncio
+import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
 
+import httpx
+
+from app.services.generation.rate_limiter import RateLimitExceeded, acquire
+
+logger = logging.getLogger(__name__)
+
+# Concurrent single-job polls when a provider has no batch endpoint
+POLL_JOBS_CONCURRENCY = 10
+# A poll is skipped (and rescheduled by the poller) rather than queued for
+# longer than this behind the provider's rate limit
+POLL_THROTTLE_MAX_WAIT_SECONDS = 5.0
+
 
 class JobType(str, Enum):
     IMG2VID = "img2vid"
@@ -33,6 +47,12 @@ class GenerationResult:
 
 
 class BaseVideoProvider(ABC):
+    # Registry name, also used to look up PROVIDER_RATE_LIMITS
+    name: str = ""
+    # API origin; one pooled HTTP client is shared per base_url (see http_client.py)
+    base_url: str = ""
+    api_key: str = ""
+
     ANIME_STYLE_PRESETS: dict[str, str] = {
         "ghibli": "studio ghibli style, watercolor, soft lighting, whimsical, miyazaki inspired",
         "shonen": "shonen anime style, dynamic action, bold lines, vibrant colors, dramatic lighting",
@@ -51,6 +71,45 @@ class BaseVideoProvider(ABC):
         """Poll job status."""
         ...
 
+    async def poll_jobs(self, provider_job_ids: list[str]) -> dict[str, GenerationResult]:
+        """Poll many jobs at once, keyed by provider_job_id.
+
+        Providers with a list/batch endpoint override this. The default fans
+        out to ``poll_job`` with bounded concurrency. Jobs whose poll raised are
+        left out of the result so the caller can retry them later; a 429 is
+        re-raised so the caller can back off the whole provider.
+        """
+        semaphore = asyncio.Semaphore(POLL_JOBS_CONCURRENCY)
+
+        async def _poll(provider_job_id: str) -> GenerationResult | None:
+            async with semaphore:
+                try:
+                    return await self.poll_job(provider_job_id)
+                except RateLimitExceeded:
+                    return None
+                except httpx.HTTPStatusError as exc:
+                    if exc.response.status_code == 429:
+                        raise
+                    logger.warning("Polling %s failed: %s", provider_job_id, exc)
+                    return None
+                except Exception as exc:
+                    logger.warning("Polling %s failed: %s", provider_job_id, exc)
+                    return None
+
+        results = await asyncio.gather(*(_poll(pid) for pid in provider_job_ids))
+        return {
+            pid: result
+            for pid, result in zip(provider_job_ids, results)
+            if result is not None
+        }
+
+    async def _throttle(self, max_wait: float | None = None) -> None:
+        """Take a request slot from this provider/API key's shared rate limit."""
+        await acquire(self.name, self.api_key, max_wait)
+
+    async def _throttle_poll(self) -> None:
+        await self._throttle(POLL_THROTTLE_MAX_WAIT_SECONDS)
+
     def _build_anime_prompt(self, prompt: str, style_preset: str) -> str:
         style_prefix = self.ANIME_STYLE_PRESETS.get(
             style_preset, self.ANIME_STYLE_PRESETS["ghibli"]
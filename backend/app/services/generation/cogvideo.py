@@ -10,6 +10,7 @@ from app.services.generation.base_provider import (
     GenerationResult,
     JobType,
 )
+from app.services.generation.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +20,12 @@ ZHIPU_API_BASE = "https://open.bigmodel.cn/api/paas/v4"
 class CogVideoProvider(BaseVideoProvider):
     """ZhipuAI CogVideoX-3 video generation provider."""
 
-    def __init__(self, api_key: str) -> None:
+    name = "cogvideo"
+    base_url = ZHIPU_API_BASE
+
+    def __init__(self, api_key: str, http_client: httpx.AsyncClient | None = None) -> None:
         self.api_key = api_key
+        self.client = http_client or get_http_client(self.base_url)
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
@@ -38,24 +43,26 @@ class CogVideoProvider(BaseVideoProvider):
         else:
             raise ValueError(f"Unsupported job type for CogVideo: {request.job_type}")
 
-        # Retry with exponential backoff on 429 rate limits
+        # The shared token bucket should keep us under the limit; the 429
+        # backoff remains for quota used outside this service
         max_retries = 3
         for attempt in range(max_retries + 1):
-            async with httpx.AsyncClient(timeout=60) as client:
-                response = await client.post(
-                    f"{ZHIPU_API_BASE}/videos/generations",
-                    json=payload,
-                    headers=self.headers,
-                )
-                if response.status_code == 429 and attempt < max_retries:
-                    wait = 30 * (2 ** attempt)  # 30s, 60s, 120s
-                    body = response.text[:300]
-                    logger.warning("CogVideoX 429 rate limited, retrying in %ds (attempt %d/%d). Response: %s", wait, attempt + 1, max_retries, body)
-                    await asyncio.sleep(wait)
-                    continue
-                response.raise_for_status()
-                data = response.json()
-                break
+            await self._throttle()
+            response = await self.client.post(
+                f"{ZHIPU_API_BASE}/videos/generations",
+                json=payload,
+                headers=self.headers,
+                timeout=60,
+            )
+            if response.status_code == 429 and attempt < max_retries:
+                wait = 30 * (2 ** attempt)  # 30s, 60s, 120s
+                body = response.text[:300]
+                logger.warning("CogVideoX 429 rate limited, retrying in %ds (attempt %d/%d). Response: %s", wait, attempt + 1, max_retries, body)
+                await asyncio.sleep(wait)
+                continue
+            response.raise_for_status()
+            data = response.json()
+            break
 
         task_id = data.get("id")
         if not task_id:
@@ -64,23 +71,27 @@ class CogVideoProvider(BaseVideoProvider):
         return task_id
 
     async def poll_job(self, provider_job_id: str) -> GenerationResult:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(
-                f"{ZHIPU_API_BASE}/async-result/{provider_job_id}",
-                headers=self.headers,
+        await self._throttle_poll()
+        response = await self.client.get(
+            f"{ZHIPU_API_BASE}/async-result/{provider_job_id}",
+            headers=self.headers,
+            timeout=30,
+        )
+        if response.status_code == 429:
+            # Rate limited, not failed: let the poller back off and retry
+            response.raise_for_status()
+        if response.status_code >= 400:
+            try:
+                err_data = response.json()
+                err_msg = err_data.get("message") or err_data.get("error", {}).get("message", str(err_data))
+            except Exception:
+                err_msg = response.text
+            return GenerationResult(
+                status="failed",
+                provider_job_id=provider_job_id,
+                error=f"ZhipuAI API error ({response.status_code}): {err_msg}",
             )
-            if response.status_code >= 400:
-                try:
-                    err_data = response.json()
-                    err_msg = err_data.get("message") or err_data.get("error", {}).get("message", str(err_data))
-                except Exception:
-                    err_msg = response.text
-                return GenerationResult(
-                    status="failed",
-                    provider_job_id=provider_job_id,
-                    error=f"ZhipuAI API error ({response.status_code}): {err_msg}",
-                )
-            data = response.json()
+        data = response.json()
 
         task_status = data.get("task_status", "PROCESSING")
 
@@ -152,9 +163,8 @@ class CogVideoProvider(BaseVideoProvider):
         internal_base = f"http://{settings.MINIO_ENDPOINT}"
         fetch_url = url.replace(public_base, internal_base)
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.get(fetch_url)
-            resp.raise_for_status()
+        resp = await get_http_client(internal_base).get(fetch_url, timeout=30)
+        resp.raise_for_status()
         content_type = resp.headers.get("content-type", "image/jpeg")
         b64 = base64.b64encode(resp.content).decode()
         return f"data:{content_type};base64,{b64}"
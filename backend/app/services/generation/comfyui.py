@@ -1,7 +1,9 @@
 import json
+import logging
 import uuid
 
 import httpx
+import redis.asyncio as aioredis
 
 from app.config import settings
 from app.services.generation.base_provider import (
@@ -10,44 +12,72 @@ from app.services.generation.base_provider import (
     GenerationResult,
     JobType,
 )
+from app.services.generation.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# ComfyUI sends execution events only to the clientId that queued a prompt.
+# The poller's ComfyUIEventListener keeps its own clientId here while its
+# socket is open, so submissions from any worker tag prompts with it.
+LISTENER_CLIENT_ID_KEY = "comfyui:listener_client_id"
+LISTENER_CLIENT_ID_TTL_SECONDS = 60
+
+
+async def listener_client_id() -> str | None:
+    """The clientId of a connected event listener, if one is advertised."""
+    client = aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    try:
+        return await client.get(LISTENER_CLIENT_ID_KEY)
+    except aioredis.RedisError as e:
+        logger.warning("ComfyUI listener clientId lookup failed: %s", e)
+        return None
+    finally:
+        await client.aclose()
 
 
 class ComfyUIProvider(BaseVideoProvider):
-    def __init__(self, api_key: str = "") -> None:
-        self.base_url = settings.COMFYUI_URL
+    name = "comfyui"
+    base_url = settings.COMFYUI_URL
+
+    def __init__(self, api_key: str = "", http_client: httpx.AsyncClient | None = None) -> None:
+        self.client = http_client or get_http_client(self.base_url)
+        # Used when no listener is connected; the poller then polls instead
         self.client_id = uuid.uuid4().hex
 
     async def submit_job(self, request: GenerationRequest) -> str:
+        await self._throttle()
         enhanced_prompt = self._build_anime_prompt(request.prompt, request.style_preset)
         workflow = self._build_workflow(request, enhanced_prompt)
 
         payload = {
             "prompt": workflow,
-            "client_id": self.client_id,
+            "client_id": await listener_client_id() or self.client_id,
         }
 
-        async with httpx.AsyncClient(timeout=60) as client:
-            response = await client.post(
-                f"{self.base_url}/prompt",
-                json=payload,
-            )
-            response.raise_for_status()
-            data = response.json()
+        response = await self.client.post(
+            f"{self.base_url}/prompt",
+            json=payload,
+            timeout=60,
+        )
+        response.raise_for_status()
+        data = response.json()
 
-            prompt_id = data.get("prompt_id")
-            if not prompt_id:
-                raise RuntimeError(f"ComfyUI did not return a prompt_id: {data}")
+        prompt_id = data.get("prompt_id")
+        if not prompt_id:
+            raise RuntimeError(f"ComfyUI did not return a prompt_id: {data}")
 
-            return prompt_id
+        return prompt_id
 
     async def poll_job(self, provider_job_id: str) -> GenerationResult:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(
-                f"{self.base_url}/history/{provider_job_id}",
-            )
-            response.raise_for_status()
-            data = response.json()
+        await self._throttle_poll()
+        response = await self.client.get(
+            f"{self.base_url}/history/{provider_job_id}",
+            timeout=30,
+        )
+        response.raise_for_status()
+        return self._parse_history(provider_job_id, response.json())
 
+    def _parse_history(self, provider_job_id: str, data: dict) -> GenerationResult:
         if provider_job_id not in data:
             return GenerationResult(
                 status="processing",
@@ -62,7 +92,7 @@ class ComfyUIProvider(BaseVideoProvider):
 
         if completed or status_msg == "success":
             outputs = history.get("outputs", {})
-            video_url = self._extract_video_url(outputs)
+            video_url = self.extract_video_url(outputs)
             return GenerationResult(
                 status="completed",
                 provider_job_id=provider_job_id,
@@ -86,7 +116,7 @@ class ComfyUIProvider(BaseVideoProvider):
                 progress=50,
             )
 
-    def _extract_video_url(self, outputs: dict) -> str | None:
+    def extract_video_url(self, outputs: dict) -> str | None:
         """Walk ComfyUI outputs to find the generated video file."""
         for node_id, node_output in outputs.items():
             if "videos" in node_output:
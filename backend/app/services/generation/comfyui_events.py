@@ -0,0 +1,144 @@
+import asyncio
+import json
+import logging
+import socket
+import uuid
+from collections.abc import Awaitable, Callable
+
+import redis.asyncio as aioredis
+from websockets.asyncio.client import connect
+from websockets.exceptions import WebSocketException
+
+from app.config import settings
+from app.services.generation.comfyui import (
+    LISTENER_CLIENT_ID_KEY,
+    LISTENER_CLIENT_ID_TTL_SECONDS,
+    ComfyUIProvider,
+)
+
+logger = logging.getLogger(__name__)
+
+# Job progress range covered by sampler steps; submission already reported 10
+PROGRESS_START = 10
+PROGRESS_END = 95
+
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+
+ProgressCallback = Callable[[str, int], Awaitable[None]]
+CompletedCallback = Callable[[str, str], Awaitable[None]]
+FailedCallback = Callable[[str, str], Awaitable[None]]
+
+
+class ComfyUIEventListener:
+    """Keeps one WebSocket open to a ComfyUI instance and routes its events.
+
+    ComfyUI only sends execution events to the ``clientId`` that queued the
+    prompt. Each listener uses its own clientId, so listeners in several
+    processes don't replace each other's socket, and advertises it in Redis
+    while connected for submissions to pick up (see ``listener_client_id``).
+    """
+
+    def __init__(
+        self,
+        on_progress: ProgressCallback,
+        on_completed: CompletedCallback,
+        on_failed: FailedCallback,
+        redis_client: aioredis.Redis,
+        base_url: str = settings.COMFYUI_URL,
+        client_id: str | None = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.client_id = client_id or f"{socket.gethostname()}-{uuid.uuid4().hex}"
+        self.redis = redis_client
+        self.on_progress = on_progress
+        self.on_completed = on_completed
+        self.on_failed = on_failed
+        self.connected = False
+        self._provider = ComfyUIProvider()
+        self._finished: set[str] = set()
+
+    @property
+    def ws_url(self) -> str:
+        scheme, _, rest = self.base_url.partition("://")
+        ws_scheme = "wss" if scheme == "https" else "ws"
+        return f"{ws_scheme}://{rest}/ws?clientId={self.client_id}"
+
+    async def run(self) -> None:
+        """Listen forever, reconnecting with backoff when the socket drops."""
+        delay = RECONNECT_MIN_SECONDS
+        while True:
+            try:
+                # max_size=None: ComfyUI also streams binary preview images
+                async with connect(self.ws_url, max_size=None) as ws:
+                    self.connected = True
+                    delay = RECONNECT_MIN_SECONDS
+                    logger.info(
+                        "Connected to ComfyUI events at %s as %s", self.base_url, self.client_id
+                    )
+                    advertise = asyncio.create_task(self._advertise())
+                    try:
+                        async for message in ws:
+                            if isinstance(message, bytes):
+                                continue
+                            try:
+                                await self._dispatch(json.loads(message))
+                            except Exception:
+                                logger.exception("Error handling ComfyUI event")
+                    finally:
+                        advertise.cancel()
+            except (OSError, WebSocketException) as exc:
+                logger.warning("ComfyUI event socket unavailable (%s), retrying in %.0fs", exc, delay)
+            finally:
+                self.connected = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    async def _advertise(self) -> None:
+        """Keep this socket's clientId in Redis for as long as it is open."""
+        while True:
+            try:
+                await self.redis.set(
+                    LISTENER_CLIENT_ID_KEY, self.client_id, ex=LISTENER_CLIENT_ID_TTL_SECONDS
+                )
+            except aioredis.RedisError as exc:
+                logger.warning("Could not advertise ComfyUI clientId: %s", exc)
+            await asyncio.sleep(LISTENER_CLIENT_ID_TTL_SECONDS / 3)
+
+    async def _dispatch(self, event: dict) -> None:
+        event_type = event.get("type")
+        data = event.get("data") or {}
+        prompt_id = data.get("prompt_id")
+        if not prompt_id or prompt_id in self._finished:
+            return
+
+        if event_type == "progress":
+            total = data.get("max") or 0
+            if total:
+                span = PROGRESS_END - PROGRESS_START
+                progress = PROGRESS_START + int(span * data.get("value", 0) / total)
+                await self.on_progress(prompt_id, progress)
+
+        elif event_type == "executed":
+            node_id = data.get("node") or data.get("display_node")
+            video_url = self._provider.extract_video_url({node_id: data.get("output") or {}})
+            if video_url:
+                # The VHS_VideoCombine node has written the file; no need to wait
+                self._mark_finished(prompt_id)
+                await self.on_completed(prompt_id, video_url)
+
+        elif event_type == "execution_error":
+            self._mark_finished(prompt_id)
+            error = data.get("exception_message") or "ComfyUI workflow failed"
+            node_type = data.get("node_type")
+            await self.on_failed(prompt_id, f"{node_type}: {error}" if node_type else error)
+
+        elif event_type == "execution_interrupted":
+            self._mark_finished(prompt_id)
+            await self.on_failed(prompt_id, "ComfyUI workflow was interrupted")
+
+    def _mark_finished(self, prompt_id: str) -> None:
+        # Bounded memory: only late duplicate events need filtering
+        if len(self._finished) > 10000:
+            self._finished.clear()
+        self._finished.add(prompt_id)
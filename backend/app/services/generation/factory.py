@@ -1,12 +1,23 @@
+import httpx
+
 from app.services.generation.base_provider import BaseVideoProvider
 from app.services.generation.cogvideo import CogVideoProvider
 from app.services.generation.comfyui import ComfyUIProvider
 from app.services.generation.hailuo import JimengProvider, ViduProvider
+from app.services.generation.http_client import get_http_client
 from app.services.generation.kling import KlingProvider
 
 
-def get_provider(provider_name: str, api_key: str = "") -> BaseVideoProvider:
-    """Create and return the appropriate video generation provider."""
+def get_provider(
+    provider_name: str,
+    api_key: str = "",
+    http_client: httpx.AsyncClient | None = None,
+) -> BaseVideoProvider:
+    """Create and return the appropriate video generation provider.
+
+    Unless a client is injected, the provider reuses the process-wide pooled
+    client for its base URL instead of opening a connection per request.
+    """
     providers: dict[str, type[BaseVideoProvider]] = {
         "kling": KlingProvider,
         "jimeng": JimengProvider,
@@ -22,4 +33,6 @@ def get_provider(provider_name: str, api_key: str = "") -> BaseVideoProvider:
             f"Available providers: {', '.join(providers.keys())}"
         )
 
-    return provider_class(api_key)
+    if http_client is None:
+        http_client = get_http_client(provider_class.base_url)
+    return provider_class(api_key, http_client=http_client)
@@ -9,6 +9,7 @@ from app.services.generation.base_provider import (
     GenerationResult,
     JobType,
 )
+from app.services.generation.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -21,14 +22,19 @@ SEEDANCE_MODEL_I2V = "doubao-seedance-1-5-pro-251215"
 
 
 class JimengProvider(BaseVideoProvider):
-    def __init__(self, api_key: str) -> None:
+    name = "jimeng"
+    base_url = JIMENG_API_BASE
+
+    def __init__(self, api_key: str, http_client: httpx.AsyncClient | None = None) -> None:
         self.api_key = api_key
+        self.client = http_client or get_http_client(self.base_url)
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
 
     async def submit_job(self, request: GenerationRequest) -> str:
+        await self._throttle()
         enhanced_prompt = self._build_anime_prompt(request.prompt, request.style_preset)
 
         if request.job_type in (JobType.TXT2VID, JobType.STORY):
@@ -40,33 +46,34 @@ class JimengProvider(BaseVideoProvider):
         else:
             raise ValueError(f"Unsupported job type for Jimeng: {request.job_type}")
 
-        async with httpx.AsyncClient(timeout=60) as client:
-            response = await client.post(
-                f"{JIMENG_API_BASE}/contents/generations/tasks",
-                json=payload,
-                headers=self.headers,
-            )
-            if response.status_code >= 400:
-                logger.error("Jimeng API error %s: %s", response.status_code, response.text)
-            response.raise_for_status()
-            data = response.json()
-
-            task_id = data.get("id")
-            if not task_id:
-                task_id = data.get("data", {}).get("id")
-            if not task_id:
-                raise RuntimeError(f"Jimeng API did not return an id: {data}")
-
-            return task_id
+        response = await self.client.post(
+            f"{JIMENG_API_BASE}/contents/generations/tasks",
+            json=payload,
+            headers=self.headers,
+            timeout=60,
+        )
+        if response.status_code >= 400:
+            logger.error("Jimeng API error %s: %s", response.status_code, response.text)
+        response.raise_for_status()
+        data = response.json()
+
+        task_id = data.get("id")
+        if not task_id:
+            task_id = data.get("data", {}).get("id")
+        if not task_id:
+            raise RuntimeError(f"Jimeng API did not return an id: {data}")
+
+        return task_id
 
     async def poll_job(self, provider_job_id: str) -> GenerationResult:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(
-                f"{JIMENG_API_BASE}/contents/generations/tasks/{provider_job_id}",
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            data = response.json()
+        await self._throttle_poll()
+        response = await self.client.get(
+            f"{JIMENG_API_BASE}/contents/generations/tasks/{provider_job_id}",
+            headers=self.headers,
+            timeout=30,
+        )
+        response.raise_for_status()
+        data = response.json()
 
         status = data.get("status", "unknown")
 
@@ -156,9 +163,8 @@ class JimengProvider(BaseVideoProvider):
         internal_base = f"http://{settings.MINIO_ENDPOINT}"
         fetch_url = url.replace(public_base, internal_base)
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.get(fetch_url)
-            resp.raise_for_status()
+        resp = await get_http_client(internal_base).get(fetch_url, timeout=30)
+        resp.raise_for_status()
         content_type = resp.headers.get("content-type", "image/jpeg")
         b64 = base64.b64encode(resp.content).decode()
         return f"data:{content_type};base64,{b64}"
@@ -168,50 +174,56 @@ VIDU_API_BASE = "https://api.vidu.com/ent/v1"
 
 
 class ViduProvider(BaseVideoProvider):
-    def __init__(self, api_key: str) -> None:
+    name = "vidu"
+    base_url = VIDU_API_BASE
+
+    def __init__(self, api_key: str, http_client: httpx.AsyncClient | None = None) -> None:
         self.api_key = api_key
+        self.client = http_client or get_http_client(self.base_url)
         self.headers = {
             "Authorization": f"Token {api_key}",
             "Content-Type": "application/json",
         }
 
     async def submit_job(self, request: GenerationRequest) -> str:
+        await self._throttle()
         enhanced_prompt = self._build_anime_prompt(request.prompt, request.style_preset)
 
-        async with httpx.AsyncClient(timeout=60) as client:
-            if request.job_type in (JobType.TXT2VID, JobType.STORY):
-                payload = self._build_txt2vid_payload(request, enhanced_prompt)
-            elif request.job_type == JobType.IMG2VID:
-                payload = self._build_img2vid_payload(request, enhanced_prompt)
-            elif request.job_type == JobType.VID2ANIME:
-                payload = self._build_vid2anime_payload(request, enhanced_prompt)
-            else:
-                raise ValueError(f"Unsupported job type for Vidu: {request.job_type}")
-
-            response = await client.post(
-                f"{VIDU_API_BASE}/tasks",
-                json=payload,
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            task_id = data.get("task_id")
-            if not task_id:
-                task_id = data.get("id")
-            if not task_id:
-                raise RuntimeError(f"Vidu API did not return a task_id: {data}")
+        if request.job_type in (JobType.TXT2VID, JobType.STORY):
+            payload = self._build_txt2vid_payload(request, enhanced_prompt)
+        elif request.job_type == JobType.IMG2VID:
+            payload = self._build_img2vid_payload(request, enhanced_prompt)
+        elif request.job_type == JobType.VID2ANIME:
+            payload = self._build_vid2anime_payload(request, enhanced_prompt)
+        else:
+            raise ValueError(f"Unsupported job type for Vidu: {request.job_type}")
+
+        response = await self.client.post(
+            f"{VIDU_API_BASE}/tasks",
+            json=payload,
+            headers=self.headers,
+            timeout=60,
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        task_id = data.get("task_id")
+        if not task_id:
+            task_id = data.get("id")
+        if not task_id:
+            raise RuntimeError(f"Vidu API did not return a task_id: {data}")
 
-            return task_id
+        return task_id
 
     async def poll_job(self, provider_job_id: str) -> GenerationResult:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(
-                f"{VIDU_API_BASE}/tasks/{provider_job_id}",
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            data = response.json()
+        await self._throttle_poll()
+        response = await self.client.get(
+            f"{VIDU_API_BASE}/tasks/{provider_job_id}",
+            headers=self.headers,
+            timeout=30,
+        )
+        response.raise_for_status()
+        data = response.json()
 
         status = data.get("status", "unknown")
 
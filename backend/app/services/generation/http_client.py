@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+
+from app.config import settings
+
+_clients: dict[str, tuple[asyncio.AbstractEventLoop | None, httpx.AsyncClient]] = {}
+
+
+def _current_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _build_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=settings.PROVIDER_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.PROVIDER_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.PROVIDER_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.PROVIDER_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            settings.PROVIDER_HTTP_TIMEOUT,
+            connect=settings.PROVIDER_HTTP_CONNECT_TIMEOUT,
+        ),
+    )
+
+
+def get_http_client(base_url: str) -> httpx.AsyncClient:
+    """Return the shared connection-pooled client for a provider base URL.
+
+    Clients are bound to the event loop that created them, so a new one is
+    built if the caller runs on a different loop than the cached client.
+    """
+    loop = _current_loop()
+    cached = _clients.get(base_url)
+    if cached is not None:
+        cached_loop, client = cached
+        if cached_loop is loop and not client.is_closed:
+            return client
+
+    client = _build_client()
+    _clients[base_url] = (loop, client)
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close every shared client owned by the running loop."""
+    loop = _current_loop()
+    for base_url, (client_loop, client) in list(_clients.items()):
+        if client_loop is loop:
+            await client.aclose()
+            del _clients[base_url]
@@ -1,3 +1,5 @@
+import logging
+
 import httpx
 
 from app.services.generation.base_provider import (
@@ -6,65 +8,115 @@ from app.services.generation.base_provider import (
     GenerationResult,
     JobType,
 )
+from app.services.generation.http_client import get_http_client
+from app.services.generation.rate_limiter import RateLimitExceeded
+
+logger = logging.getLogger(__name__)
 
 KLING_API_BASE = "https://api.klingai.com/v1"
+# Most recent tasks returned by one task-list query; older jobs fall back to single polls
+KLING_TASK_LIST_PAGE_SIZE = 500
 
 
 class KlingProvider(BaseVideoProvider):
-    def __init__(self, api_key: str) -> None:
+    name = "kling"
+    base_url = KLING_API_BASE
+
+    def __init__(self, api_key: str, http_client: httpx.AsyncClient | None = None) -> None:
         self.api_key = api_key
+        self.client = http_client or get_http_client(self.base_url)
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
 
     async def submit_job(self, request: GenerationRequest) -> str:
+        await self._throttle()
         enhanced_prompt = self._build_anime_prompt(request.prompt, request.style_preset)
 
-        async with httpx.AsyncClient(timeout=60) as client:
-            if request.job_type == JobType.IMG2VID:
-                payload = self._build_img2vid_payload(request, enhanced_prompt)
-                response = await client.post(
-                    f"{KLING_API_BASE}/videos/image2video",
-                    json=payload,
-                    headers=self.headers,
-                )
-            elif request.job_type in (JobType.TXT2VID, JobType.STORY):
-                payload = self._build_txt2vid_payload(request, enhanced_prompt)
-                response = await client.post(
-                    f"{KLING_API_BASE}/videos/text2video",
-                    json=payload,
-                    headers=self.headers,
-                )
-            elif request.job_type == JobType.VID2ANIME:
-                payload = self._build_vid2anime_payload(request, enhanced_prompt)
-                response = await client.post(
-                    f"{KLING_API_BASE}/videos/image2video",
-                    json=payload,
-                    headers=self.headers,
-                )
-            else:
-                raise ValueError(f"Unsupported job type: {request.job_type}")
+        if request.job_type == JobType.IMG2VID:
+            payload = self._build_img2vid_payload(request, enhanced_prompt)
+            endpoint = "image2video"
+        elif request.job_type in (JobType.TXT2VID, JobType.STORY):
+            payload = self._build_txt2vid_payload(request, enhanced_prompt)
+            endpoint = "text2video"
+        elif request.job_type == JobType.VID2ANIME:
+            payload = self._build_vid2anime_payload(request, enhanced_prompt)
+            endpoint = "image2video"
+        else:
+            raise ValueError(f"Unsupported job type: {request.job_type}")
 
-            response.raise_for_status()
-            data = response.json()
+        response = await self.client.post(
+            f"{KLING_API_BASE}/videos/{endpoint}",
+            json=payload,
+            headers=self.headers,
+            timeout=60,
+        )
+        response.raise_for_status()
+        data = response.json()
 
-            task_id = data.get("data", {}).get("task_id")
-            if not task_id:
-                raise RuntimeError(f"Kling API did not return a task_id: {data}")
+        task_id = data.get("data", {}).get("task_id")
+        if not task_id:
+            raise RuntimeError(f"Kling API did not return a task_id: {data}")
 
-            return task_id
+        return task_id
 
     async def poll_job(self, provider_job_id: str) -> GenerationResult:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(
-                f"{KLING_API_BASE}/videos/{provider_job_id}",
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            data = response.json()
+        await self._throttle_poll()
+        response = await self.client.get(
+            f"{KLING_API_BASE}/videos/{provider_job_id}",
+            headers=self.headers,
+            timeout=30,
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        return self._parse_task(provider_job_id, data.get("data", {}))
+
+    async def poll_jobs(self, provider_job_ids: list[str]) -> dict[str, GenerationResult]:
+        """Resolve jobs from the task-list endpoints, falling back per job."""
+        wanted = set(provider_job_ids)
+        results: dict[str, GenerationResult] = {}
+
+        for endpoint in ("text2video", "image2video"):
+            if not wanted - results.keys():
+                break
+            try:
+                await self._throttle_poll()
+            except RateLimitExceeded:
+                # Out of poll budget: leave the rest for the next tick, as the
+                # per-job fallback would be throttled too
+                return results
+            try:
+                response = await self.client.get(
+                    f"{KLING_API_BASE}/videos/{endpoint}",
+                    params={"pageNum": 1, "pageSize": KLING_TASK_LIST_PAGE_SIZE},
+                    headers=self.headers,
+                    timeout=30,
+                )
+                response.raise_for_status()
+                tasks = response.json().get("data") or []
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code == 429:
+                    # Per-job fallback would only add to the rate limit
+                    raise
+                logger.warning("Kling task list %s failed: %s", endpoint, exc)
+                continue
+            except (httpx.HTTPError, ValueError) as exc:
+                logger.warning("Kling task list %s failed: %s", endpoint, exc)
+                continue
+
+            for task_data in tasks:
+                task_id = task_data.get("task_id")
+                if task_id in wanted:
+                    results[task_id] = self._parse_task(task_id, task_data)
+
+        missing = [pid for pid in provider_job_ids if pid not in results]
+        if missing:
+            results.update(await super().poll_jobs(missing))
+        return results
 
-        task_data = data.get("data", {})
+    def _parse_task(self, provider_job_id: str, task_data: dict) -> GenerationResult:
         status = task_data.get("task_status", "unknown")
 
         if status == "succeed":
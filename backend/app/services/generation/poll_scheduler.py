@@ -0,0 +1,99 @@
+import json
+import time
+from dataclasses import asdict, dataclass
+
+import redis.asyncio as aioredis
+
+SCHEDULE_KEY = "generation:poll_schedule"
+STATE_KEY = "generation:poll_state"
+# "{provider}:{provider_job_id}" -> job_id, for provider push events
+PROVIDER_INDEX_KEY = "generation:poll_provider_index"
+
+# Seconds a claimed job stays invisible to other pollers. If the poller that
+# claimed it dies before rescheduling or completing, the job becomes due again.
+CLAIM_LEASE_SECONDS = 60
+
+# Atomically pop up to ARGV[2] due job ids and push them out by the lease.
+_CLAIM_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, job_id in ipairs(due) do
+    redis.call('ZADD', KEYS[1], ARGV[3], job_id)
+end
+return due
+"""
+
+
+def _index_field(provider: str, provider_job_id: str) -> str:
+    return f"{provider}:{provider_job_id}"
+
+
+@dataclass
+class InFlightJob:
+    job_id: str
+    user_id: str
+    provider: str
+    provider_job_id: str
+    job_type: str
+    duration: int
+    submitted_at: float
+    deadline: float
+
+
+class PollScheduler:
+    """Redis sorted-set timer wheel of provider jobs awaiting completion.
+
+    Scores are the unix time of the next poll; per-job state lives in a hash
+    so any poller process can pick up any job.
+    """
+
+    def __init__(self, redis_client: aioredis.Redis) -> None:
+        self.redis = redis_client
+        self._claim = redis_client.register_script(_CLAIM_SCRIPT)
+
+    async def schedule(self, job: InFlightJob, delay: float) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(STATE_KEY, job.job_id, json.dumps(asdict(job)))
+            pipe.hset(PROVIDER_INDEX_KEY, _index_field(job.provider, job.provider_job_id), job.job_id)
+            pipe.zadd(SCHEDULE_KEY, {job.job_id: time.time() + delay})
+            await pipe.execute()
+
+    async def reschedule(self, job_id: str, delay: float) -> None:
+        await self.redis.zadd(SCHEDULE_KEY, {job_id: time.time() + delay})
+
+    async def claim_due(self, limit: int) -> list[InFlightJob]:
+        now = time.time()
+        job_ids = await self._claim(
+            keys=[SCHEDULE_KEY], args=[now, limit, now + CLAIM_LEASE_SECONDS]
+        )
+        if not job_ids:
+            return []
+
+        raw_states = await self.redis.hmget(STATE_KEY, job_ids)
+        jobs: list[InFlightJob] = []
+        for job_id, raw in zip(job_ids, raw_states):
+            if raw is None:
+                # State vanished (job completed elsewhere); drop the timer too
+                await self.redis.zrem(SCHEDULE_KEY, job_id)
+                continue
+            jobs.append(InFlightJob(**json.loads(raw)))
+        return jobs
+
+    async def get(self, job_id: str) -> InFlightJob | None:
+        raw = await self.redis.hget(STATE_KEY, job_id)
+        return InFlightJob(**json.loads(raw)) if raw is not None else None
+
+    async def find_by_provider_job(self, provider: str, provider_job_id: str) -> InFlightJob | None:
+        job_id = await self.redis.hget(PROVIDER_INDEX_KEY, _index_field(provider, provider_job_id))
+        return await self.get(job_id) if job_id is not None else None
+
+    async def complete(self, job: InFlightJob) -> bool:
+        """Stop tracking a job. Returns False if another poller already did."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(SCHEDULE_KEY, job.job_id)
+            pipe.hdel(STATE_KEY, job.job_id)
+            pipe.hdel(PROVIDER_INDEX_KEY, _index_field(job.provider, job.provider_job_id))
+            _, removed, _ = await pipe.execute()
+        return bool(removed)
+
+    async def in_flight_count(self) -> int:
+        return await self.redis.zcard(SCHEDULE_KEY)
@@ -0,0 +1,174 @@
+import time
+
+import httpx
+import redis.asyncio as aioredis
+
+from app.services.generation.poll_scheduler import InFlightJob
+
+# "{provider}:{job_type}:{duration}" -> hash of bucket index -> count, plus "n"
+HISTOGRAM_KEY_PREFIX = "generation:completion_hist"
+# "{scope}" -> consecutive 429 count / unix time before which polls are held back
+BACKOFF_LEVEL_KEY_PREFIX = "generation:poll_backoff_level"
+BACKOFF_UNTIL_KEY_PREFIX = "generation:poll_backoff_until"
+
+BUCKET_SECONDS = 5
+# Once a histogram holds this many samples all counts are halved, so recent
+# completions outweigh old ones when providers speed up or slow down
+HISTOGRAM_MAX_SAMPLES = 2000
+# Below this many samples the fixed default interval is used
+MIN_SAMPLES = 20
+# Poll when this share of the jobs still running at the current age are
+# expected to have finished: sparse before the bulk of completions, dense
+# around them
+TARGET_QUANTILE = 0.2
+# Past the slowest 10% of observed completions, fall back to the default
+TAIL_SHARE = 0.1
+
+DEFAULT_POLL_SECONDS = 5
+MIN_POLL_SECONDS = 2
+# Upper bound so progress updates keep flowing on long renders
+MAX_POLL_SECONDS = 30
+
+BACKOFF_BASE_SECONDS = 10
+BACKOFF_MAX_SECONDS = 300
+# A provider's backoff level resets after this long without a 429
+BACKOFF_RESET_SECONDS = 600
+
+# Histograms are re-read from Redis at most this often per process
+HISTOGRAM_CACHE_SECONDS = 30
+
+_RECORD_SCRIPT = """
+redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+local total = redis.call('HINCRBY', KEYS[1], 'n', 1)
+if total > tonumber(ARGV[2]) then
+    local fields = redis.call('HGETALL', KEYS[1])
+    local kept = 0
+    for i = 1, #fields, 2 do
+        if fields[i] ~= 'n' then
+            local count = math.floor(tonumber(fields[i + 1]) / 2)
+            if count > 0 then
+                redis.call('HSET', KEYS[1], fields[i], count)
+                kept = kept + count
+            else
+                redis.call('HDEL', KEYS[1], fields[i])
+            end
+        end
+    end
+    redis.call('HSET', KEYS[1], 'n', kept)
+end
+"""
+
+
+def _histogram_key(job: InFlightJob) -> str:
+    return f"{HISTOGRAM_KEY_PREFIX}:{job.provider}:{job.job_type}:{job.duration}"
+
+
+def _backoff_scope(job: InFlightJob) -> str:
+    # ComfyUI is one shared instance; hosted APIs rate-limit per account
+    return job.provider if job.provider == "comfyui" else f"{job.provider}:{job.user_id}"
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    try:
+        return float(exc.response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+class PollTiming:
+    """Learns how long provider jobs take and picks when to poll them next.
+
+    Completion times are kept as coarse histograms in Redis so every poller
+    shares them. Rate-limit backoff is shared the same way.
+    """
+
+    def __init__(self, redis_client: aioredis.Redis) -> None:
+        self.redis = redis_client
+        self._record = redis_client.register_script(_RECORD_SCRIPT)
+        self._histograms: dict[str, tuple[float, dict[int, int]]] = {}
+
+    async def record_completion(self, job: InFlightJob, completed_at: float | None = None) -> None:
+        elapsed = (completed_at or time.time()) - job.submitted_at
+        bucket = max(0, int(elapsed // BUCKET_SECONDS))
+        await self._record(keys=[_histogram_key(job)], args=[bucket, HISTOGRAM_MAX_SAMPLES])
+
+    async def next_delay(self, job: InFlightJob, now: float | None = None) -> float:
+        """Seconds until the job should be polled again."""
+        now = now or time.time()
+        delay = await self._adaptive_delay(job, now)
+
+        backoff_until = await self.redis.get(f"{BACKOFF_UNTIL_KEY_PREFIX}:{_backoff_scope(job)}")
+        if backoff_until is not None:
+            delay = max(delay, float(backoff_until) - now)
+
+        # Always get one last look before the deadline fails the job
+        remaining = job.deadline - now
+        if remaining > 0:
+            delay = min(delay, max(remaining, MIN_POLL_SECONDS))
+        return delay
+
+    async def record_rate_limited(self, job: InFlightJob, exc: BaseException) -> float:
+        """Hold back polls sharing the job's rate limit; returns the backoff."""
+        scope = _backoff_scope(job)
+        level_key = f"{BACKOFF_LEVEL_KEY_PREFIX}:{scope}"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(level_key)
+            pipe.expire(level_key, BACKOFF_RESET_SECONDS)
+            level, _ = await pipe.execute()
+
+        backoff = min(BACKOFF_BASE_SECONDS * 2 ** (int(level) - 1), BACKOFF_MAX_SECONDS)
+        retry_after = _retry_after(exc)
+        if retry_after is not None:
+            backoff = max(backoff, retry_after)
+
+        await self.redis.set(
+            f"{BACKOFF_UNTIL_KEY_PREFIX}:{scope}", time.time() + backoff, ex=int(backoff) + 1
+        )
+        return backoff
+
+    async def _adaptive_delay(self, job: InFlightJob, now: float) -> float:
+        counts = await self._histogram(_histogram_key(job))
+        if sum(counts.values()) < MIN_SAMPLES:
+            return DEFAULT_POLL_SECONDS
+
+        # Only completions later than the job's current age are still possible
+        # (spread evenly within a bucket, so part of the current one is gone)
+        position = (now - job.submitted_at) / BUCKET_SECONDS
+        current = int(position)
+        remaining: list[tuple[float, float, float]] = []
+        for bucket, count in sorted(counts.items()):
+            if bucket > current:
+                remaining.append((bucket, bucket + 1, count))
+            elif bucket == current:
+                remaining.append((position, bucket + 1, count * (bucket + 1 - position)))
+        total = sum(count for _, _, count in remaining)
+        if total < TAIL_SHARE * sum(counts.values()):
+            # Slower than nearly everything seen so far: an outlier, so dense
+            # polling would mostly be wasted
+            return DEFAULT_POLL_SECONDS
+
+        target = TARGET_QUANTILE * total
+        seen = 0.0
+        for start, end, count in remaining:
+            if seen + count >= target:
+                break
+            seen += count
+        finish_by = start + (end - start) * (target - seen) / count
+        delay = (finish_by - position) * BUCKET_SECONDS
+        return min(max(delay, MIN_POLL_SECONDS), MAX_POLL_SECONDS)
+
+    async def _histogram(self, key: str) -> dict[int, int]:
+        cached = self._histograms.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        raw = await self.redis.hgetall(key)
+        counts = {int(field): int(value) for field, value in raw.items() if field != "n"}
+        self._histograms[key] = (time.monotonic() + HISTOGRAM_CACHE_SECONDS, counts)
+        return counts
@@ -0,0 +1,89 @@
+import asyncio
+import hashlib
+
+import redis.asyncio as aioredis
+
+from app.config import settings
+
+# "{provider}:{key fingerprint}" -> hash of tokens / last refill time
+BUCKET_KEY_PREFIX = "generation:rate_bucket"
+
+# Take one token, refilling at ARGV[1]/s up to ARGV[2]. Tokens may go negative:
+# the caller has then reserved a slot and sleeps for the returned seconds, so
+# concurrent waiters queue up instead of retrying in a thundering herd. A
+# reservation longer than ARGV[3] seconds (if given) is refused and returned
+# negated without taking the token.
+_ACQUIRE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / rate
+    if max_wait >= 0 and wait > max_wait then
+        return tostring(-wait)
+    end
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens - 1, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((burst - tokens + 1) / rate) + 1)
+return tostring(wait)
+"""
+
+_redis: tuple[asyncio.AbstractEventLoop, aioredis.Redis] | None = None
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, provider: str, retry_after: float) -> None:
+        super().__init__(f"{provider} rate limit exceeded, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+def _get_redis() -> aioredis.Redis:
+    global _redis
+    loop = asyncio.get_running_loop()
+    if _redis is None or _redis[0] is not loop:
+        _redis = (loop, aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True))
+    return _redis[1]
+
+
+def key_fingerprint(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+async def acquire(provider: str, api_key: str, max_wait: float | None = None) -> None:
+    """Wait for a request slot in the provider/API-key token bucket.
+
+    Buckets live in Redis, so every worker and poller draws from the same
+    quota. Providers without a configured rate are not limited. Raises
+    ``RateLimitExceeded`` instead of waiting longer than ``max_wait``.
+    """
+    rate = settings.PROVIDER_RATE_LIMITS.get(provider, 0)
+    if rate <= 0:
+        return
+    burst = settings.PROVIDER_RATE_BURST.get(provider, 1)
+
+    redis_client = _get_redis()
+    script = redis_client.register_script(_ACQUIRE_SCRIPT)
+    wait = float(await script(
+        keys=[f"{BUCKET_KEY_PREFIX}:{provider}:{key_fingerprint(api_key)}"],
+        args=[rate, max(burst, 1), -1 if max_wait is None else max_wait],
+    ))
+    if wait < 0:
+        raise RateLimitExceeded(provider, -wait)
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+
+async def close_rate_limiter() -> None:
+    global _redis
+    if _redis is not None and _redis[0] is asyncio.get_running_loop():
+        await _redis[1].aclose()
+        _redis = None
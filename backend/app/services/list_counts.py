@@ -0,0 +1,88 @@
+"""Cached list totals for the gallery and job listings.
+
+Counting a big account's rows on every page request costs a scan of all of
+them, so totals are cached in one Redis hash per user and list (one field
+per filter combination). Paths that insert or delete rows call
+``invalidate`` after committing. Status changes are not tracked
+individually; the hash expires after LIST_COUNT_TTL_SECONDS, which bounds
+how stale a filtered total can get. Redis being unavailable only costs the
+direct count.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Mapping
+
+import redis.asyncio as aioredis
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "list_counts"
+VIDEOS = "videos"
+JOBS = "jobs"
+
+_redis: tuple[asyncio.AbstractEventLoop, aioredis.Redis] | None = None
+
+
+def _get_redis() -> aioredis.Redis:
+    global _redis
+    loop = asyncio.get_running_loop()
+    if _redis is None or _redis[0] is not loop:
+        _redis = (loop, aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True))
+    return _redis[1]
+
+
+def _key(kind: str, user_id: uuid.UUID | str) -> str:
+    return f"{KEY_PREFIX}:{kind}:{user_id}"
+
+
+def _field(filters: Mapping[str, object]) -> str:
+    return "&".join(f"{k}={v}" for k, v in sorted(filters.items()) if v is not None) or "all"
+
+
+async def cached_count(
+    db: AsyncSession,
+    kind: str,
+    user_id: uuid.UUID,
+    filters: Mapping[str, object],
+    count_query: Select,
+) -> int:
+    """Total for ``count_query``, served from Redis when cached."""
+    key, field = _key(kind, user_id), _field(filters)
+    try:
+        cached = await _get_redis().hget(key, field)
+        if cached is not None:
+            return int(cached)
+    except aioredis.RedisError as e:
+        logger.warning("List count cache read failed: %s", e)
+
+    total = (await db.execute(count_query)).scalar() or 0
+    try:
+        async with _get_redis().pipeline(transaction=True) as pipe:
+            pipe.hset(key, field, total)
+            # Only a fresh hash gets a TTL, so a busy one still expires
+            pipe.expire(key, settings.LIST_COUNT_TTL_SECONDS, nx=True)
+            await pipe.execute()
+    except aioredis.RedisError as e:
+        logger.warning("List count cache write failed: %s", e)
+    return total
+
+
+async def invalidate(user_id: uuid.UUID | str, *kinds: str) -> None:
+    """Drop a user's cached totals for ``kinds`` after rows were added or removed."""
+    try:
+        await _get_redis().delete(*(_key(kind, user_id) for kind in kinds))
+    except aioredis.RedisError as e:
+        logger.warning("List count cache invalidation failed: %s", e)
+
+
+async def close_list_counts() -> None:
+    global _redis
+    if _redis is not None and _redis[0] is asyncio.get_running_loop():
+        await _redis[1].aclose()
+        _redis = None
@@ -0,0 +1,93 @@
+"""Adaptive-bitrate HLS packaging.
+
+One ffmpeg run decodes the source once and encodes a small ladder of
+renditions into fragmented-MP4 HLS segments plus a master playlist, all in
+a flat directory so playlists can reference everything relatively.
+"""
+
+import logging
+import os
+from collections.abc import Sequence
+
+from app.config import settings
+from app.services.media.probe import MediaInfo
+from app.services.media.runner import run_ffmpeg
+
+logger = logging.getLogger(__name__)
+
+MASTER_PLAYLIST = "master.m3u8"
+# Video bitrate (kbit/s) per rendition height
+LADDER_BITRATES = {1080: 5000, 720: 2800, 540: 2000, 480: 1400, 360: 800, 240: 400}
+AUDIO_BITRATE = "128k"
+
+CONTENT_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".m4s": "video/iso.segment",
+    ".mp4": "video/mp4",
+}
+
+
+def plan_ladder(info: MediaInfo, heights: Sequence[int]) -> list[tuple[int, int]]:
+    """(height, kbit/s) renditions for a source, never upscaling it."""
+    source_height = info.height or max(heights)
+    chosen = sorted({h for h in heights if h <= source_height}, reverse=True)
+    if not chosen:
+        chosen = [source_height // 2 * 2]
+    return [(h, LADDER_BITRATES.get(h) or max(h * 4, 300)) for h in chosen]
+
+
+async def package_hls(source: str, info: MediaInfo, out_dir: str) -> bool:
+    """Write an HLS ladder for ``source`` into ``out_dir``, with MASTER_PLAYLIST as its entry point."""
+    ladder = plan_ladder(info, settings.HLS_RENDITION_HEIGHTS)
+    segment = settings.HLS_SEGMENT_SECONDS
+    n = len(ladder)
+
+    split = f"[0:v]split={n}" + "".join(f"[s{i}]" for i in range(n))
+    scales = [f"[s{i}]scale=-2:{h}[v{i}]" for i, (h, _) in enumerate(ladder)]
+    cmd = [
+        "ffmpeg", "-v", "error", "-i", source,
+        "-filter_complex", ";".join([split, *scales]),
+    ]
+    stream_map = []
+    for i, (_, kbps) in enumerate(ladder):
+        cmd += [
+            "-map", f"[v{i}]",
+            f"-c:v:{i}", "libx264",
+            f"-b:v:{i}", f"{kbps}k",
+            f"-maxrate:v:{i}", f"{int(kbps * 1.1)}k",
+            f"-bufsize:v:{i}", f"{kbps * 2}k",
+        ]
+        if info.has_audio:
+            cmd += ["-map", "0:a:0"]
+            stream_map.append(f"v:{i},a:{i}")
+        else:
+            stream_map.append(f"v:{i}")
+    if info.has_audio:
+        cmd += ["-c:a", "aac", "-b:a", AUDIO_BITRATE, "-ac", "2"]
+    cmd += [
+        "-preset", "veryfast",
+        "-pix_fmt", "yuv420p",
+        # Every segment starts on a keyframe, at the same times in all renditions
+        "-force_key_frames", f"expr:gte(t,n_forced*{segment})",
+        "-sc_threshold", "0",
+        "-f", "hls",
+        "-hls_time", str(segment),
+        "-hls_playlist_type", "vod",
+        "-hls_segment_type", "fmp4",
+        "-hls_flags", "independent_segments",
+        "-hls_fmp4_init_filename", "stream_%v_init.mp4",
+        "-hls_segment_filename", os.path.join(out_dir, "stream_%v_%04d.m4s"),
+        "-master_pl_name", MASTER_PLAYLIST,
+        "-var_stream_map", " ".join(stream_map),
+        os.path.join(out_dir, "stream_%v.m3u8"),
+    ]
+    if not await run_ffmpeg(cmd, "HLS packaging"):
+        return False
+    if not os.path.exists(os.path.join(out_dir, MASTER_PLAYLIST)):
+        logger.error("HLS packaging produced no master playlist in %s", out_dir)
+        return False
+    return True
+
+
+def content_type_for(filename: str) -> str:
+    return CONTENT_TYPES.get(os.path.splitext(filename)[1], "application/octet-stream")
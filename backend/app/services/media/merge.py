@@ -0,0 +1,399 @@
+"""Smart-render merge of story scenes with crossfade transitions.
+
+Only the crossfade windows actually change, so each scene is cut at
+keyframes into head / body / tail. Bodies are stream-copied; each tail is
+re-encoded together with the next scene's head through ``xfade``. Audio is
+crossfaded in a separate audio-only pass and muxed in without re-encoding
+the video again. Encoding work therefore scales with the number of
+transitions, not with the story length, and cached pieces are reused
+across re-merges. Independent pieces are rendered concurrently.
+
+Scenes that cannot be stream-copied together are first conformed to one
+profile by ``conform_scenes``, which encodes GOP-aligned chunks of every
+scene in parallel and joins them without re-encoding.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from functools import partial
+
+from app.config import settings
+from app.services.media.mezzanine import video_encode_args
+from app.services.media.probe import MediaInfo, probe_media
+from app.services.media.runner import run_ffmpeg
+from app.services.media.segment_cache import SegmentCache
+
+logger = logging.getLogger(__name__)
+
+# Video codecs the transition windows can be re-encoded to bit-compatibly
+ENCODERS = {"h264": "libx264"}
+X264_PROFILES = {
+    "Constrained Baseline": "baseline",
+    "Baseline": "baseline",
+    "Main": "main",
+    "High": "high",
+}
+# Transition windows are short, so spend bits to match the copied bodies
+TRANSITION_CRF = 18
+# Shortest stream-copied body worth cutting out
+MIN_BODY_SECONDS = 0.05
+
+
+@dataclass
+class MergeInput:
+    """One scene to merge.
+
+    ``fetch`` returns a path or URL ffmpeg can read the scene video from.
+    It is only called when a piece has to be rendered, so scenes whose
+    pieces are all cached are never read. It may block, so it is called in
+    worker threads, possibly several at once.
+    """
+
+    info: MediaInfo
+    content_hash: str
+    fetch: Callable[[], str]
+
+
+async def _source(scene: MergeInput) -> str:
+    return await asyncio.to_thread(scene.fetch)
+
+
+def _compatible(media: Sequence[MediaInfo]) -> bool:
+    """Whether every scene shares the codec parameters concat-copy needs."""
+    first = media[0]
+    if first.codec not in ENCODERS or first.params.get("profile") not in X264_PROFILES:
+        return False
+    keys = ("codec", "width", "height", "fps")
+    params = ("pix_fmt", "profile", "time_base")
+    return all(
+        all(getattr(info, k) == getattr(first, k) for k in keys)
+        and all(info.params.get(p) == first.params.get(p) for p in params)
+        for info in media[1:]
+    )
+
+
+def plan_bodies(media: Sequence[MediaInfo], fade: float) -> list[tuple[float, float]] | None:
+    """Pick each scene's stream-copyable body as a (start, end) keyframe range.
+
+    A body starts at the first keyframe after the incoming crossfade and ends
+    at the last keyframe before the outgoing one. Returns None if any scene
+    has no such range (too short, or too few keyframes).
+    """
+    last = len(media) - 1
+    bodies: list[tuple[float, float]] = []
+    for i, info in enumerate(media):
+        keyframes = info.keyframes
+        if not keyframes or not info.duration:
+            return None
+        if i == 0:
+            start = keyframes[0]
+        else:
+            start = next((k for k in keyframes if k >= fade), None)
+        if i == last:
+            end = info.duration
+        else:
+            end = next((k for k in reversed(keyframes) if k <= info.duration - fade), None)
+        if start is None or end is None or end - start < MIN_BODY_SECONDS:
+            return None
+        bodies.append((start, end))
+    return bodies
+
+
+async def _copy_body(src: str, start: float, end: float, duration: float, out: str) -> bool:
+    cmd = ["ffmpeg", "-v", "error", "-ss", f"{start:.6f}", "-i", src]
+    if end < duration:
+        cmd += ["-t", f"{end - start:.6f}"]
+    cmd += ["-map", "0:v:0", "-an", "-c", "copy", "-avoid_negative_ts", "make_zero",
+            "-f", "mpegts", "-y", out]
+    return await run_ffmpeg(cmd, "body copy")
+
+
+async def _render_transition(
+    src_a: str,
+    tail_start: float,
+    info_a: MediaInfo,
+    src_b: str,
+    head_end: float,
+    fade: float,
+    out: str,
+) -> bool:
+    offset = info_a.duration - tail_start - fade
+    filter_complex = (
+        "[0:v]setpts=PTS-STARTPTS[a];[1:v]setpts=PTS-STARTPTS[b];"
+        f"[a][b]xfade=transition=fade:duration={fade}:offset={offset:.6f},"
+        f"format={info_a.params['pix_fmt']}[v]"
+    )
+    cmd = [
+        "ffmpeg", "-v", "error",
+        "-ss", f"{tail_start:.6f}", "-i", src_a,
+        "-t", f"{head_end:.6f}", "-i", src_b,
+        "-filter_complex", filter_complex,
+        "-map", "[v]", "-an",
+        "-c:v", ENCODERS[info_a.codec],
+        "-profile:v", X264_PROFILES[info_a.params["profile"]],
+        "-preset", "fast",
+        "-crf", str(TRANSITION_CRF),
+        "-r", str(info_a.fps),
+        "-f", "mpegts", "-y", out,
+    ]
+    return await run_ffmpeg(cmd, "transition render")
+
+
+async def _normalize_audio(src: str | None, info: MediaInfo, out: str) -> bool:
+    """Write a scene's audio (or silence) in one format, exactly as long as its video."""
+    if src is not None:
+        inputs = ["-i", src]
+    else:
+        inputs = ["-f", "lavfi", "-t", f"{info.duration:.6f}",
+                  "-i", "anullsrc=channel_layout=stereo:sample_rate=44100"]
+    audio_filter = (
+        f"aresample=44100,aformat=sample_fmts=s16:channel_layouts=stereo,"
+        f"apad=whole_dur={info.duration:.6f},atrim=end={info.duration:.6f}"
+    )
+    return await run_ffmpeg(
+        ["ffmpeg", "-v", "error", *inputs, "-vn", "-af", audio_filter, "-c:a", "flac", "-y", out],
+        "audio normalize",
+    )
+
+
+async def _crossfade_audio(tracks: Sequence[str], fade: float, out: str) -> bool:
+    inputs: list[str] = []
+    for track in tracks:
+        inputs += ["-i", track]
+    filters: list[str] = []
+    prev = "0:a"
+    for i in range(1, len(tracks)):
+        label = "aout" if i == len(tracks) - 1 else f"x{i}"
+        filters.append(f"[{prev}][{i}:a]acrossfade=d={fade}:c1=tri:c2=tri[{label}]")
+        prev = label
+    return await run_ffmpeg(
+        [
+            "ffmpeg", "-v", "error", *inputs,
+            "-filter_complex", ";".join(filters),
+            "-map", "[aout]",
+            "-c:a", "aac", "-b:a", "128k",
+            "-y", out,
+        ],
+        "audio crossfade",
+    )
+
+
+async def smart_merge(
+    scenes: Sequence[MergeInput],
+    output_path: str,
+    fade: float = 0.5,
+    cache: SegmentCache | None = None,
+    workers: int = 1,
+) -> bool:
+    """Merge scenes by re-encoding only their crossfade windows.
+
+    With a ``cache``, every body, normalized audio track and transition is
+    looked up by content hash before rendering and stored after, so a
+    re-merge after regenerating one scene only renders the pieces touching
+    it, and only reads the scenes those pieces need. Up to ``workers``
+    pieces are rendered at once.
+
+    Returns False without producing output when the scenes cannot be
+    stream-copied together (mismatched codec parameters or unsuitable
+    keyframes) or a step fails; the caller then conforms them or falls back
+    to a full render.
+    """
+    media = [scene.info for scene in scenes]
+    if len(scenes) < 2 or not _compatible(media):
+        return False
+    bodies = plan_bodies(media, fade)
+    if bodies is None:
+        logger.info("Scenes lack keyframes at the crossfade boundaries")
+        return False
+
+    work_dir = tempfile.mkdtemp(dir=os.path.dirname(output_path) or None)
+    limit = asyncio.Semaphore(max(workers, 1))
+
+    async def piece(key: str, name: str, render: Callable[[str], Awaitable[bool]]) -> str | None:
+        path = os.path.join(work_dir, name)
+        async with limit:
+            if cache is not None and await asyncio.to_thread(cache.fetch, key, path):
+                return path
+            if not await render(path):
+                return None
+        if cache is not None:
+            await asyncio.to_thread(cache.store, key, path)
+        return path
+
+    async def body(i: int, out: str) -> bool:
+        scene = scenes[i]
+        start, end = bodies[i]
+        return await _copy_body(await _source(scene), start, end, scene.info.duration, out)
+
+    async def audio_track(i: int, out: str) -> bool:
+        scene = scenes[i]
+        src = await _source(scene) if scene.info.has_audio else None
+        return await _normalize_audio(src, scene.info, out)
+
+    async def transition(i: int, out: str) -> bool:
+        scene, nxt = scenes[i], scenes[i + 1]
+        return await _render_transition(
+            await _source(scene), bodies[i][1], scene.info,
+            await _source(nxt), bodies[i + 1][0], fade, out,
+        )
+
+    try:
+        # (cache key, file name, renderer) for the video pieces in timeline
+        # order, then for each scene's audio track
+        video_specs: list[tuple[str, str, Callable[[str], Awaitable[bool]]]] = []
+        audio_specs: list[tuple[str, str, Callable[[str], Awaitable[bool]]]] = []
+        last = len(scenes) - 1
+        for i, scene in enumerate(scenes):
+            start, end = bodies[i]
+            video_specs.append((
+                f"{scene.content_hash}/body_{start:.3f}_{end:.3f}.ts",
+                f"body_{i:03d}.ts",
+                partial(body, i),
+            ))
+            audio_specs.append((
+                f"{scene.content_hash}/audio_{scene.info.duration:.3f}.flac",
+                f"audio_{i:03d}.flac",
+                partial(audio_track, i),
+            ))
+            if i < last:
+                nxt = scenes[i + 1]
+                head_end = bodies[i + 1][0]
+                video_specs.append((
+                    f"{scene.content_hash}_{nxt.content_hash}/xfade_{end:.3f}_{head_end:.3f}_{fade}.ts",
+                    f"xfade_{i:03d}.ts",
+                    partial(transition, i),
+                ))
+
+        results = await asyncio.gather(*(piece(*spec) for spec in video_specs + audio_specs))
+        if None in results:
+            return False
+        pieces, tracks = results[:len(video_specs)], results[len(video_specs):]
+
+        audio = os.path.join(work_dir, "audio.m4a")
+        if not await _crossfade_audio(tracks, fade, audio):
+            return False
+
+        concat_list = os.path.join(work_dir, "pieces.txt")
+        with open(concat_list, "w") as f:
+            f.writelines(f"file '{p}'\n" for p in pieces)
+
+        return await run_ffmpeg(
+            [
+                "ffmpeg", "-v", "error",
+                "-f", "concat", "-safe", "0", "-i", concat_list,
+                "-i", audio,
+                "-map", "0:v", "-map", "1:a",
+                "-c", "copy",
+                "-movflags", "+faststart",
+                "-y", output_path,
+            ],
+            "concat mux",
+        )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+async def _encode_chunk(
+    src: str, start: float, length: float, width: int, height: int, threads: int, out: str
+) -> bool:
+    return await run_ffmpeg(
+        [
+            "ffmpeg", "-v", "error",
+            "-ss", f"{start:.6f}", "-i", src, "-t", f"{length:.6f}",
+            "-map", "0:v:0", "-an",
+            *video_encode_args(width, height, threads),
+            "-f", "mpegts", "-y", out,
+        ],
+        "chunk encode",
+    )
+
+
+async def _join_chunks(chunks: Sequence[str], src: str, has_audio: bool, out: str) -> bool:
+    """Concatenate a scene's encoded chunks and carry its original audio over."""
+    concat_list = f"{out}.txt"
+    with open(concat_list, "w") as f:
+        f.writelines(f"file '{c}'\n" for c in chunks)
+    cmd = ["ffmpeg", "-v", "error", "-f", "concat", "-safe", "0", "-i", concat_list]
+    if has_audio:
+        cmd += ["-i", src, "-map", "0:v", "-map", "1:a:0", "-c:a", "aac", "-b:a", "128k"]
+    else:
+        cmd += ["-map", "0:v"]
+    cmd += ["-c:v", "copy", "-movflags", "+faststart", "-y", out]
+    return await run_ffmpeg(cmd, "chunk join")
+
+
+def _chunk_ranges(duration: float, chunk_seconds: float) -> list[tuple[float, float]]:
+    """Split a clip into (start, length) chunks on the mezzanine keyframe grid."""
+    gop = settings.MEZZANINE_KEYFRAME_SECONDS
+    step = max(round(chunk_seconds / gop), 1) * gop
+    ranges: list[tuple[float, float]] = []
+    start = 0.0
+    while duration - start > 1e-3:
+        length = min(step, duration - start)
+        ranges.append((start, length))
+        start += step
+    return ranges
+
+
+async def conform_scenes(
+    scenes: Sequence[MergeInput],
+    work_dir: str,
+    width: int,
+    height: int,
+    workers: int,
+    chunk_seconds: float,
+) -> list[MergeInput] | None:
+    """Re-encode scenes to the mezzanine video profile, in parallel chunks.
+
+    Every scene is split into ``chunk_seconds`` chunks aligned to the
+    keyframe grid; chunks of all scenes are encoded concurrently by up to
+    ``workers`` ffmpeg processes and then concatenated per scene with stream
+    copy. The results can be merged with ``smart_merge``. Returns None if
+    any step fails.
+    """
+    workers = max(workers, 1)
+    threads = max((os.cpu_count() or 1) // workers, 1)
+    jobs: list[tuple[int, str, float, float]] = []
+    for i, scene in enumerate(scenes):
+        for n, (start, length) in enumerate(_chunk_ranges(scene.info.duration, chunk_seconds)):
+            jobs.append((i, os.path.join(work_dir, f"conform_{i:03d}_{n:04d}.ts"), start, length))
+
+    limit = asyncio.Semaphore(workers)
+
+    async def encode(job: tuple[int, str, float, float]) -> bool:
+        i, out, start, length = job
+        src = await _source(scenes[i])
+        async with limit:
+            return await _encode_chunk(src, start, length, width, height, threads, out)
+
+    if not all(await asyncio.gather(*(encode(job) for job in jobs))):
+        return None
+
+    profile = (
+        f"{width}x{height}:{settings.MEZZANINE_FPS}:{settings.MEZZANINE_KEYFRAME_SECONDS}:"
+        f"{settings.MEZZANINE_CRF}:{settings.MEZZANINE_PRESET}"
+    )
+    conformed: list[MergeInput] = []
+    for i, scene in enumerate(scenes):
+        out = os.path.join(work_dir, f"conformed_{i:03d}.mp4")
+        chunks = [path for idx, path, _, _ in jobs if idx == i]
+        if not await _join_chunks(chunks, await _source(scene), scene.info.has_audio, out):
+            return None
+        for path in chunks:
+            os.unlink(path)
+        info = await probe_media(out)
+        if info is None:
+            return None
+        conformed.append(MergeInput(
+            info=info,
+            # Stable across re-merges, so pieces of conformed scenes are cached too
+            content_hash=hashlib.sha256(f"{scene.content_hash}:{profile}".encode()).hexdigest(),
+            fetch=lambda out=out: out,
+        ))
+    return conformed
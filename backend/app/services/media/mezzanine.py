@@ -0,0 +1,97 @@
+"""Conforming scene videos to the common mezzanine format.
+
+Providers return different frame rates, sizes and audio layouts. Once every
+scene shares one profile (H.264 High, fixed fps, size by aspect ratio, AAC
+stereo, keyframes on a fixed grid) merges never need to re-encode more than
+their crossfade windows.
+"""
+
+from app.config import settings
+from app.services.media.probe import MediaInfo
+from app.services.media.runner import run_ffmpeg
+
+# Width:height of the mezzanine frame per requested aspect ratio
+ASPECT_RATIOS = {
+    "16:9": (16, 9),
+    "9:16": (9, 16),
+    "1:1": (1, 1),
+    "4:3": (4, 3),
+    "3:4": (3, 4),
+}
+
+
+def mezzanine_size(aspect_ratio: str) -> tuple[int, int]:
+    """Frame size for an aspect ratio, with MEZZANINE_SHORT_SIDE as the short side."""
+    w, h = ASPECT_RATIOS.get(aspect_ratio, ASPECT_RATIOS["16:9"])
+    short = settings.MEZZANINE_SHORT_SIDE
+    if w >= h:
+        width, height = short * w / h, short
+    else:
+        width, height = short, short * h / w
+    # libx264 with yuv420p needs even dimensions
+    return int(width) // 2 * 2, int(height) // 2 * 2
+
+
+def conforms(info: MediaInfo, aspect_ratio: str) -> bool:
+    """Whether a video already matches the mezzanine profile."""
+    width, height = mezzanine_size(aspect_ratio)
+    return (
+        info.codec == "h264"
+        and info.params.get("profile") == "High"
+        and info.params.get("pix_fmt") == "yuv420p"
+        and (info.width, info.height) == (width, height)
+        and info.fps == float(settings.MEZZANINE_FPS)
+        and info.has_audio
+        and info.params.get("audio_codec") == "aac"
+        and info.params.get("channels") == 2
+        and info.keyframe_interval is not None
+        and info.keyframe_interval <= settings.MEZZANINE_KEYFRAME_SECONDS + 0.01
+    )
+
+
+def video_encode_args(width: int, height: int, threads: int | None = None) -> list[str]:
+    """ffmpeg output arguments that encode video to the mezzanine profile.
+
+    Keyframes sit on a fixed grid relative to the output start, so clips cut
+    at multiples of MEZZANINE_KEYFRAME_SECONDS stay on the same grid.
+    """
+    fps = settings.MEZZANINE_FPS
+    gop = settings.MEZZANINE_KEYFRAME_SECONDS
+    video_filter = (
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps},format=yuv420p"
+    )
+    args = [
+        "-vf", video_filter,
+        "-c:v", "libx264",
+        "-profile:v", "high",
+        "-preset", settings.MEZZANINE_PRESET,
+        "-crf", str(settings.MEZZANINE_CRF),
+        # Keyframes on a fixed grid so merges can cut bodies right at the crossfades
+        "-force_key_frames", f"expr:gte(t,n_forced*{gop})",
+        "-sc_threshold", "0",
+    ]
+    if threads:
+        args += ["-threads", str(threads)]
+    return args
+
+
+async def render_mezzanine(src: str, out: str, info: MediaInfo, aspect_ratio: str) -> bool:
+    """Re-encode ``src`` to the mezzanine profile, adding silence if it has no audio."""
+    width, height = mezzanine_size(aspect_ratio)
+
+    cmd = ["ffmpeg", "-v", "error", "-i", src]
+    if info.has_audio:
+        cmd += ["-map", "0:v:0", "-map", "0:a:0"]
+    else:
+        cmd += [
+            "-f", "lavfi", "-i", "anullsrc=channel_layout=stereo:sample_rate=44100",
+            "-map", "0:v:0", "-map", "1:a:0", "-shortest",
+        ]
+    cmd += [
+        *video_encode_args(width, height),
+        "-c:a", "aac", "-b:a", "128k", "-ar", "44100", "-ac", "2",
+        "-movflags", "+faststart",
+        "-y", out,
+    ]
+    return await run_ffmpeg(cmd, "mezzanine render")
@@ -0,0 +1,153 @@
+"""Single-pass preview artifacts for the gallery.
+
+One ffmpeg run decodes a video once and splits the frames into three
+branches: poster candidates (the opening frame and scene cuts, with their
+scene-change scores), a seek-preview sprite sheet, and a short muted MP4
+hover preview. The sprite's WebVTT index is written from the same layout.
+"""
+
+import logging
+import math
+import os
+import re
+from dataclasses import dataclass
+
+from app.services.media.probe import MediaInfo
+from app.services.media.runner import run_ffmpeg
+
+logger = logging.getLogger(__name__)
+
+POSTER_WIDTH = 640
+# Frames scoring above this against the previous frame count as scene cuts
+SCENE_THRESHOLD = 0.3
+MAX_POSTER_CANDIDATES = 8
+SPRITE_INTERVAL_SECONDS = 1.0
+SPRITE_TILE_WIDTH = 160
+SPRITE_MAX_COLUMNS = 10
+PREVIEW_SECONDS = 3.0
+PREVIEW_WIDTH = 320
+PREVIEW_FPS = 12
+
+POSTER_PATTERN = "poster_%02d.jpg"
+SPRITE_FILE = "sprite.jpg"
+VTT_FILE = "sprite.vtt"
+PREVIEW_FILE = "preview.mp4"
+SCORES_FILE = "scores.txt"
+
+
+@dataclass
+class PreviewFiles:
+    """Local paths of the generated artifacts."""
+
+    poster: str
+    sprite: str
+    sprite_vtt: str
+    preview: str
+
+
+def _even(value: float) -> int:
+    return max(int(value) // 2 * 2, 2)
+
+
+def _sprite_layout(info: MediaInfo) -> tuple[int, int, int, int, int]:
+    """(tiles, columns, rows, tile width, tile height) of the sprite sheet."""
+    tiles = max(math.ceil(info.duration / SPRITE_INTERVAL_SECONDS), 1)
+    columns = min(tiles, SPRITE_MAX_COLUMNS)
+    rows = math.ceil(tiles / columns)
+    aspect = (info.height / info.width) if info.width and info.height else 9 / 16
+    return tiles, columns, rows, SPRITE_TILE_WIDTH, _even(SPRITE_TILE_WIDTH * aspect)
+
+
+def _timestamp(seconds: float) -> str:
+    hours, rem = divmod(seconds, 3600)
+    minutes, secs = divmod(rem, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}"
+
+
+def write_sprite_vtt(info: MediaInfo, sprite_name: str, path: str) -> None:
+    """WebVTT cues mapping each time range to its tile in the sprite sheet."""
+    tiles, columns, _, width, height = _sprite_layout(info)
+    lines = ["WEBVTT", ""]
+    for i in range(tiles):
+        start = i * SPRITE_INTERVAL_SECONDS
+        end = min(start + SPRITE_INTERVAL_SECONDS, info.duration) if info.duration else start + 1
+        x, y = (i % columns) * width, (i // columns) * height
+        lines += [
+            f"{_timestamp(start)} --> {_timestamp(end)}",
+            f"{sprite_name}#xywh={x},{y},{width},{height}",
+            "",
+        ]
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+
+
+def _best_poster(scores_path: str, out_dir: str) -> str | None:
+    """Pick the candidate with the highest scene-change score.
+
+    ``metadata=print`` logs one score line per selected frame, in the order
+    the candidates were written.
+    """
+    candidates = sorted(
+        name for name in os.listdir(out_dir) if re.fullmatch(r"poster_\d+\.jpg", name)
+    )
+    if not candidates:
+        return None
+    scores: list[float] = []
+    if os.path.exists(scores_path):
+        with open(scores_path) as f:
+            scores = [
+                float(m.group(1))
+                for m in re.finditer(r"lavfi\.scene_score=([0-9.]+)", f.read())
+            ]
+    best = max(range(len(candidates)), key=lambda i: scores[i] if i < len(scores) else 0.0)
+    return os.path.join(out_dir, candidates[best])
+
+
+async def generate_previews(source: str, info: MediaInfo, out_dir: str) -> PreviewFiles | None:
+    """Decode ``source`` once and write poster, sprite sheet + VTT and hover preview."""
+    _, columns, rows, tile_width, tile_height = _sprite_layout(info)
+    preview_length = min(PREVIEW_SECONDS, info.duration) if info.duration else PREVIEW_SECONDS
+    preview_start = max(min(info.duration * 0.25, info.duration - preview_length), 0.0)
+    scores_path = os.path.join(out_dir, SCORES_FILE)
+
+    # Poster candidates: the first frame from 1 s on (earlier for very short
+    # clips), plus every scene cut
+    fallback_at = min(1.0, info.duration / 2) if info.duration else 0.0
+    poster_select = (
+        f"select='(isnan(prev_selected_t)*gte(t\\,{fallback_at:.3f}))"
+        f"+(gt(scene\\,{SCENE_THRESHOLD})*gte(t\\,0.5))'"
+    )
+    filter_complex = ";".join([
+        "[0:v]split=3[p][s][h]",
+        f"[p]{poster_select},metadata=mode=print:key=lavfi.scene_score:file={scores_path},"
+        f"scale={POSTER_WIDTH}:-2[poster]",
+        f"[s]fps=1/{SPRITE_INTERVAL_SECONDS},scale={tile_width}:{tile_height},"
+        f"tile={columns}x{rows}[sprite]",
+        f"[h]trim=start={preview_start:.3f}:duration={preview_length:.3f},setpts=PTS-STARTPTS,"
+        f"fps={PREVIEW_FPS},scale={PREVIEW_WIDTH}:-2,format=yuv420p[hover]",
+    ])
+    cmd = [
+        "ffmpeg", "-v", "error", "-y", "-i", source,
+        "-filter_complex", filter_complex,
+        "-map", "[poster]", "-vsync", "0",
+        "-frames:v", str(MAX_POSTER_CANDIDATES), "-q:v", "3",
+        os.path.join(out_dir, POSTER_PATTERN),
+        "-map", "[sprite]", "-frames:v", "1", "-update", "1", "-q:v", "5",
+        os.path.join(out_dir, SPRITE_FILE),
+        "-map", "[hover]", "-an",
+        "-c:v", "libx264", "-preset", "veryfast", "-crf", "30",
+        "-movflags", "+faststart",
+        os.path.join(out_dir, PREVIEW_FILE),
+    ]
+    if not await run_ffmpeg(cmd, "preview generation"):
+        return None
+
+    poster = _best_poster(scores_path, out_dir)
+    sprite = os.path.join(out_dir, SPRITE_FILE)
+    preview = os.path.join(out_dir, PREVIEW_FILE)
+    if poster is None or not os.path.exists(sprite) or not os.path.exists(preview):
+        logger.warning("Preview generation for %s left artifacts missing", source)
+        return None
+    sprite_vtt = os.path.join(out_dir, VTT_FILE)
+    write_sprite_vtt(info, SPRITE_FILE, sprite_vtt)
+    return PreviewFiles(poster=poster, sprite=sprite, sprite_vtt=sprite_vtt, preview=preview)
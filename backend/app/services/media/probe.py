@@ -0,0 +1,150 @@
+import hashlib
+import json
+import logging
+import subprocess
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+
+from app.services.media.runner import run_tool
+
+logger = logging.getLogger(__name__)
+
+# Keyframe timestamps kept per video; generated clips have far fewer
+MAX_KEYFRAMES = 1000
+HASH_CHUNK_SIZE = 1024 * 1024
+PROBE_TIMEOUT_SECONDS = 120
+
+
+@dataclass
+class MediaInfo:
+    """Technical facts about a video file, from a single ffprobe run."""
+
+    duration: float
+    width: int | None = None
+    height: int | None = None
+    codec: str | None = None
+    fps: float | None = None
+    has_audio: bool = False
+    keyframe_interval: float | None = None
+    # Video keyframe timestamps (seconds), where stream copies can be cut
+    keyframes: list[float] = field(default_factory=list)
+    # Extra stream parameters (pix_fmt, profile, time_base, audio codec...)
+    # used to decide whether files can be stream-copied together
+    params: dict = field(default_factory=dict)
+
+    def to_json(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_json(cls, data: dict) -> "MediaInfo":
+        return cls(**data)
+
+
+def _parse_rate(rate: str | None) -> float | None:
+    if not rate or rate == "0/0":
+        return None
+    num, _, den = rate.partition("/")
+    try:
+        value = float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return round(value, 3) if value > 0 else None
+
+
+def _keyframes(packets: list[dict], stream_index: int) -> list[float]:
+    return sorted(
+        float(p["pts_time"])
+        for p in packets
+        if p.get("stream_index") == stream_index
+        and "K" in p.get("flags", "")
+        and p.get("pts_time") not in (None, "N/A")
+    )[:MAX_KEYFRAMES]
+
+
+def _keyframe_interval(keyframes: list[float], duration: float) -> float | None:
+    if len(keyframes) >= 2:
+        return round((keyframes[-1] - keyframes[0]) / (len(keyframes) - 1), 3)
+    if len(keyframes) == 1 and duration:
+        # A single GOP spans the whole clip
+        return round(duration, 3)
+    return None
+
+
+def parse_probe_output(data: dict) -> MediaInfo:
+    streams = data.get("streams") or []
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
+    try:
+        duration = float((data.get("format") or {}).get("duration") or (video or {}).get("duration") or 0)
+    except ValueError:
+        duration = 0.0
+
+    info = MediaInfo(duration=duration, has_audio=audio is not None)
+    if video is not None:
+        info.width = video.get("width")
+        info.height = video.get("height")
+        info.codec = video.get("codec_name")
+        info.fps = _parse_rate(video.get("avg_frame_rate")) or _parse_rate(video.get("r_frame_rate"))
+        info.keyframes = _keyframes(data.get("packets") or [], video.get("index", 0))
+        info.keyframe_interval = _keyframe_interval(info.keyframes, duration)
+        info.params.update({
+            "pix_fmt": video.get("pix_fmt"),
+            "profile": video.get("profile"),
+            "time_base": video.get("time_base"),
+        })
+    if audio is not None:
+        info.params.update({
+            "audio_codec": audio.get("codec_name"),
+            "sample_rate": audio.get("sample_rate"),
+            "channels": audio.get("channels"),
+        })
+    return info
+
+
+async def probe_media(source: str) -> MediaInfo | None:
+    """Probe a video file (or URL) once for streams, format and keyframes.
+
+    Keyframes come from packet flags, so nothing is decoded. Returns None if
+    ffprobe is unavailable or cannot read the input.
+    """
+    try:
+        result = await run_tool(
+            [
+                "ffprobe",
+                "-v", "error",
+                "-show_entries", "stream:format:packet=stream_index,pts_time,flags",
+                "-of", "json",
+                source,
+            ],
+            timeout=PROBE_TIMEOUT_SECONDS,
+        )
+    except FileNotFoundError as e:
+        logger.warning("ffprobe not available: %s", e)
+        return None
+    except subprocess.TimeoutExpired:
+        logger.warning("ffprobe timed out for %s", source)
+        return None
+
+    if result.returncode != 0:
+        logger.warning("ffprobe failed for %s: %s", source, result.stderr.decode()[:500])
+        return None
+    try:
+        return parse_probe_output(json.loads(result.stdout))
+    except (ValueError, TypeError) as e:
+        logger.warning("Unreadable ffprobe output for %s: %s", source, e)
+        return None
+
+
+def hash_chunks(chunks: Iterable[bytes]) -> str:
+    """SHA-256 of streamed content, used to key derived media in caches."""
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of a file's content."""
+    with open(path, "rb") as f:
+        return hash_chunks(iter(lambda: f.read(HASH_CHUNK_SIZE), b""))
@@ -0,0 +1,79 @@
+"""Async execution of ffmpeg / ffprobe.
+
+Media tools run as asyncio subprocesses, so the worker's event loop keeps
+driving other jobs while they work. A per-loop semaphore caps how many run
+at once, every run has a timeout, and a run that times out or is cancelled
+kills its process instead of leaving it behind.
+"""
+
+import asyncio
+import logging
+import os
+import subprocess
+import weakref
+from collections.abc import Sequence
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.MEDIA_TOOL_CONCURRENCY or os.cpu_count() or 1)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def _kill(proc: asyncio.subprocess.Process) -> None:
+    if proc.returncode is None:
+        proc.kill()
+        await proc.wait()
+
+
+async def run_tool(args: Sequence[str], timeout: float | None = None) -> subprocess.CompletedProcess:
+    """Run a media tool and capture its output, like ``subprocess.run``.
+
+    Raises ``subprocess.TimeoutExpired`` after ``timeout`` seconds (default
+    MEDIA_TOOL_TIMEOUT_SECONDS) and ``FileNotFoundError`` if the tool is not
+    installed.
+    """
+    timeout = settings.MEDIA_TOOL_TIMEOUT_SECONDS if timeout is None else timeout
+    async with _semaphore():
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            await _kill(proc)
+            raise subprocess.TimeoutExpired(list(args), timeout) from None
+        except asyncio.CancelledError:
+            await _kill(proc)
+            raise
+    return subprocess.CompletedProcess(list(args), proc.returncode, stdout, stderr)
+
+
+async def run_ffmpeg(args: Sequence[str], what: str, timeout: float | None = None) -> bool:
+    """Run an ffmpeg command, logging why it failed. Returns whether it succeeded."""
+    try:
+        result = await run_tool(args, timeout=timeout)
+    except FileNotFoundError as e:
+        logger.error("FFmpeg %s failed, ffmpeg not available: %s", what, e)
+        return False
+    except subprocess.TimeoutExpired as e:
+        logger.error("FFmpeg %s timed out after %ss", what, e.timeout)
+        return False
+    if result.returncode != 0:
+        logger.error("FFmpeg %s failed: %s", what, result.stderr.decode(errors="replace")[:1000])
+        return False
+    return True
@@ -0,0 +1,36 @@
+import logging
+
+from minio.error import S3Error
+
+from app.services.minio_service import download_to_file, upload_from_file
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the way cached pieces are rendered changes
+CACHE_VERSION = 1
+CACHE_PREFIX = f"merge_cache/v{CACHE_VERSION}"
+
+
+class SegmentCache:
+    """MinIO store for merge intermediates, keyed by content hash and parameters.
+
+    Keys are derived from scene video hashes and the cut/transition
+    parameters, so a cached piece never needs invalidating: a regenerated
+    scene has a new hash and simply misses.
+    """
+
+    def fetch(self, key: str, dest_path: str) -> bool:
+        try:
+            download_to_file(f"{CACHE_PREFIX}/{key}", dest_path)
+        except S3Error as e:
+            if e.code != "NoSuchKey":
+                logger.warning("Segment cache read failed for %s: %s", key, e)
+            return False
+        return True
+
+    def store(self, key: str, path: str) -> None:
+        # Best-effort: a failed write only costs a re-render next time
+        try:
+            upload_from_file(path, f"{CACHE_PREFIX}/{key}")
+        except S3Error as e:
+            logger.warning("Segment cache write failed for %s: %s", key, e)
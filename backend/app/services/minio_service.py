@@ -1,5 +1,8 @@
+import asyncio
 import io
+import queue
 import uuid
+from collections.abc import AsyncIterator, Iterator
 from datetime import timedelta
 
 from minio import Minio
@@ -9,6 +12,9 @@ from app.config import settings
 
 _client: Minio | None = None
 
+# Multipart part size for uploads of unknown length (MinIO minimum is 5 MiB)
+STREAM_PART_SIZE = 10 * 1024 * 1024
+
 
 def get_minio_client() -> Minio:
     global _client
@@ -74,6 +80,115 @@ def upload_file_stream(
     return f"{settings.minio_public_url_base}/{bucket}/{object_name}"
 
 
+class _ChunkReader(io.RawIOBase):
+    """Blocking file-like view over chunks fed from an async producer.
+
+    Either side calls ``abort`` when it goes away so the other never blocks
+    forever on the bounded queue.
+    """
+
+    _EOF = b""
+
+    def __init__(self, max_chunks: int = 8) -> None:
+        super().__init__()
+        self._chunks: queue.Queue[bytes] = queue.Queue(max_chunks)
+        self._pending = b""
+        self._eof = False
+        self._aborted = False
+
+    def readable(self) -> bool:
+        return True
+
+    def abort(self) -> None:
+        self._aborted = True
+
+    def try_feed(self, chunk: bytes) -> bool:
+        try:
+            self._chunks.put_nowait(chunk)
+            return True
+        except queue.Full:
+            return False
+
+    def feed(self, chunk: bytes) -> None:
+        while not self._aborted:
+            try:
+                self._chunks.put(chunk, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+        raise IOError("Upload aborted")
+
+    def _next_chunk(self) -> bytes:
+        while not self._aborted:
+            try:
+                return self._chunks.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        raise IOError("Upload source aborted")
+
+    def read(self, size: int = -1) -> bytes:
+        out = bytearray()
+        while not self._eof and (size < 0 or len(out) < size):
+            if not self._pending:
+                # Hand back what we have rather than waiting for a full part
+                if out and self._chunks.empty():
+                    break
+                self._pending = self._next_chunk()
+                if not self._pending:
+                    self._eof = True
+                    break
+            take = len(self._pending) if size < 0 else size - len(out)
+            out += self._pending[:take]
+            self._pending = self._pending[take:]
+        return bytes(out)
+
+
+async def upload_chunks(
+    chunks: AsyncIterator[bytes],
+    object_name: str,
+    content_type: str = "application/octet-stream",
+    part_size: int = STREAM_PART_SIZE,
+) -> str:
+    """Stream chunks of unknown total length to MinIO via multipart upload.
+
+    Only a handful of chunks plus one part are buffered at a time, so memory
+    use does not grow with the object size.
+    """
+    client = get_minio_client()
+    bucket = settings.MINIO_BUCKET
+    reader = _ChunkReader()
+
+    def _put() -> None:
+        try:
+            client.put_object(
+                bucket,
+                object_name,
+                reader,
+                length=-1,
+                part_size=part_size,
+                content_type=content_type,
+            )
+        finally:
+            reader.abort()
+
+    upload = asyncio.ensure_future(asyncio.to_thread(_put))
+    try:
+        async for chunk in chunks:
+            if upload.done():
+                break
+            if chunk and not reader.try_feed(chunk):
+                await asyncio.to_thread(reader.feed, chunk)
+        if not upload.done() and not reader.try_feed(_ChunkReader._EOF):
+            await asyncio.to_thread(reader.feed, _ChunkReader._EOF)
+        await upload
+    except BaseException:
+        reader.abort()
+        await asyncio.gather(upload, return_exceptions=True)
+        raise
+
+    return f"{settings.minio_public_url_base}/{bucket}/{object_name}"
+
+
 def get_presigned_url(object_name: str, expires: timedelta = timedelta(hours=1)) -> str:
     """Get a presigned URL for downloading an object."""
     client = get_minio_client()
@@ -101,3 +216,32 @@ def download_object(object_name: str) -> bytes:
         if response is not None:
             response.close()
             response.release_conn()
+
+
+def iter_object_chunks(object_name: str, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """Stream an object from MinIO in chunks without holding it all in memory."""
+    client = get_minio_client()
+    response = client.get_object(settings.MINIO_BUCKET, object_name)
+    try:
+        yield from response.stream(chunk_size)
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def download_to_file(object_name: str, file_path: str) -> None:
+    """Download an object from MinIO straight into a local file."""
+    client = get_minio_client()
+    client.fget_object(settings.MINIO_BUCKET, object_name, file_path)
+
+
+def upload_from_file(
+    file_path: str,
+    object_name: str,
+    content_type: str = "application/octet-stream",
+) -> str:
+    """Upload a local file to MinIO and return the object URL."""
+    client = get_minio_client()
+    bucket = settings.MINIO_BUCKET
+    client.fput_object(bucket, object_name, file_path, content_type=content_type)
+    return f"{settings.minio_public_url_base}/{bucket}/{object_name}"
@@ -0,0 +1,96 @@
+"""Prompt search over jobs and gallery videos.
+
+Jobs carry two generated columns (see app.models.job): ``search_vector``, a
+weighted tsvector of the original prompt, enhanced prompt and style preset,
+and ``search_text``, the same text for pg_trgm. Full-text matching ranks
+whole-word hits; the trigram match catches partial words and CJK prompts,
+which the ``simple`` text search configuration does not segment. Both are
+backed by GIN indexes, as is the video title's trigram index.
+"""
+
+import uuid
+
+from sqlalchemy import ColumnElement, CompoundSelect, Float, cast, func, literal_column, or_, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+from app.models.video import Video
+
+# Inlined rather than bound, as regconfig; must match the generated column's
+TS_CONFIG = literal_column("'simple'::regconfig")
+# Highlights wrap matched words in <mark>; the rest is the prompt as stored,
+# so clients must escape it before rendering as HTML
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, MaxFragments=2"
+
+
+def _tsquery(search: str) -> ColumnElement:
+    return func.websearch_to_tsquery(TS_CONFIG, search)
+
+
+def _like_pattern(search: str) -> str:
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def job_match(search: str) -> ColumnElement[bool]:
+    """Condition matching jobs whose prompts or style contain ``search``."""
+    return or_(
+        Job.search_vector.bool_op("@@")(_tsquery(search)),
+        Job.search_text.ilike(_like_pattern(search)),
+    )
+
+
+def job_rank(search: str) -> ColumnElement[float]:
+    """Relevance of a job: full-text rank plus trigram similarity."""
+    return cast(
+        func.ts_rank_cd(Job.search_vector, _tsquery(search))
+        + func.similarity(Job.search_text, search),
+        Float,
+    )
+
+
+def matching_video_ids(search: str, user_id: uuid.UUID) -> CompoundSelect:
+    """Ids of the user's videos matching by title or by their job's prompts.
+
+    A UNION rather than one OR across the videos/jobs join: Postgres can't
+    combine GIN indexes on two tables, so an OR would scan every video of
+    the user. Each branch here is driven by its own table's indexes.
+    """
+    by_title = select(Video.id).where(
+        Video.user_id == user_id,
+        Video.title.ilike(_like_pattern(search)),
+    )
+    by_job = (
+        select(Video.id)
+        .join(Job, Video.job_id == Job.id)
+        .where(Job.user_id == user_id, job_match(search))
+    )
+    return union(by_title, by_job)
+
+
+def video_rank(search: str) -> ColumnElement[float]:
+    """Relevance of a video: its job's relevance plus title similarity.
+
+    Expects ``Job`` to be outer-joined on ``Video.job_id``.
+    """
+    return cast(
+        func.coalesce(job_rank(search), 0.0) + func.similarity(Video.title, search),
+        Float,
+    )
+
+
+async def job_highlights(
+    db: AsyncSession, job_ids: list[uuid.UUID], search: str
+) -> dict[uuid.UUID, str]:
+    """``ts_headline`` snippets of the original prompt, for one page of jobs.
+
+    Run separately from the page query so only the returned rows pay for it.
+    """
+    if not job_ids:
+        return {}
+    text = func.coalesce(Job.metadata_json["original_prompt"].astext, Job.prompt, "")
+    result = await db.execute(
+        select(Job.id, func.ts_headline(TS_CONFIG, text, _tsquery(search), HEADLINE_OPTIONS))
+        .where(Job.id.in_(job_ids))
+    )
+    return {job_id: headline for job_id, headline in result.all()}
@@ -0,0 +1,128 @@
+"""In-process cache of authenticated users for ``deps.get_current_user``.
+
+Entries are keyed by the token's ``sub`` and ``iat`` and live for
+USER_CACHE_TTL_SECONDS in a bounded LRU. Code that changes a user calls
+``invalidate_user``, which publishes the id on Redis so every API process
+evicts it. The cache only serves hits while this process is subscribed to
+that channel, so a lost subscription can't leave stale users behind.
+
+Each hit builds a fresh detached ``User`` from the cached column values:
+changes made to it are neither persisted nor visible to other requests,
+and touching an unloaded relationship raises instead of querying.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+import redis.asyncio as aioredis
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "user_cache:invalidate"
+RECONNECT_DELAY_SECONDS = 5.0
+
+CacheKey = tuple[str, int | None]
+
+_entries: "OrderedDict[CacheKey, tuple[float, dict[str, Any]]]" = OrderedDict()
+_listening = False
+_listener: asyncio.Task | None = None
+
+
+def _detached_user(values: dict[str, Any]) -> User:
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+def get(sub: str, iat: int | None) -> User | None:
+    if not _listening:
+        return None
+    key = (sub, iat)
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+    expires_at, values = entry
+    if expires_at < time.monotonic():
+        del _entries[key]
+        return None
+    _entries.move_to_end(key)
+    return _detached_user(values)
+
+
+def put(sub: str, iat: int | None, user: User) -> None:
+    if not _listening or settings.USER_CACHE_TTL_SECONDS <= 0:
+        return
+    values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    _entries[(sub, iat)] = (time.monotonic() + settings.USER_CACHE_TTL_SECONDS, values)
+    _entries.move_to_end((sub, iat))
+    while len(_entries) > settings.USER_CACHE_MAX_ENTRIES:
+        _entries.popitem(last=False)
+
+
+def _evict(sub: str) -> None:
+    for key in [key for key in _entries if key[0] == sub]:
+        del _entries[key]
+
+
+async def invalidate_user(user_id: uuid.UUID | str) -> None:
+    """Evict a changed user here and, via Redis, in every other API process."""
+    _evict(str(user_id))
+    client = aioredis.Redis.from_url(settings.REDIS_URL)
+    try:
+        await client.publish(INVALIDATION_CHANNEL, str(user_id))
+    except aioredis.RedisError as e:
+        logger.warning("User cache invalidation for %s not published: %s", user_id, e)
+    finally:
+        await client.aclose()
+
+
+async def _listen() -> None:
+    global _listening
+    while True:
+        client = aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            # Invalidations may have been missed while unsubscribed
+            _entries.clear()
+            _listening = True
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    _evict(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("User cache invalidation listener failed: %s", e)
+        finally:
+            _listening = False
+            await pubsub.aclose()
+            await client.aclose()
+        await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+
+def start() -> None:
+    """Start the invalidation listener; the cache serves nothing until it subscribes."""
+    global _listener
+    if _listener is None and settings.USER_CACHE_TTL_SECONDS > 0:
+        _listener = asyncio.create_task(_listen())
+
+
+async def stop() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.cancel()
+        try:
+            await _listener
+        except asyncio.CancelledError:
+            pass
+        _listener = None
+    _entries.clear()
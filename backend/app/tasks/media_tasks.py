@@ -0,0 +1,682 @@
+"""CPU-bound media work, routed to the ``media`` queue.
+
+Generation workers mostly wait on providers and run in a high-concurrency
+thread pool; ffmpeg work (probing, thumbnailing, mezzanine encodes, audio
+fixing and story merges) runs here instead, in process-based workers sized
+to the machine's cores, so each pool scales with its own bottleneck.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload, undefer
+
+from app.celery_app import celery_app
+from app.config import settings
+from app.models.job import Job
+from app.models.story import Scene, Story
+from app.models.video import Video
+from app.services.media.hls import MASTER_PLAYLIST, content_type_for, package_hls
+from app.services.media.merge import MergeInput, conform_scenes, smart_merge
+from app.services.media.mezzanine import conforms, mezzanine_size, render_mezzanine
+from app.services.media.preview import SPRITE_FILE, VTT_FILE, generate_previews
+from app.services.media.probe import MediaInfo, hash_chunks, hash_file, probe_media
+from app.services.media.segment_cache import SegmentCache
+from app.services.media.runner import run_ffmpeg, run_tool
+from app.services.minio_service import (
+    get_presigned_url,
+    iter_object_chunks,
+    upload_file,
+    upload_from_file,
+)
+from app.tasks.generation_tasks import (
+    _extract_minio_object_name,
+    _get_async_session,
+    _publish_job_update,
+    _run_async,
+)
+from app.tasks.story_runner import on_scene_finished
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_TIMEOUT_SECONDS = 60
+# Long enough for the slowest merge reading a scene over presigned URLs
+MEDIA_URL_TTL = timedelta(hours=6)
+
+
+async def _generate_thumbnail(source: str) -> bytes:
+    """Grab a JPEG thumbnail at the 1 second mark of a video file or URL.
+
+    Input seeking over HTTP only fetches the ranges around that frame, and
+    the image comes back through stdout, so nothing touches the disk.
+    """
+    try:
+        result = await run_tool(
+            [
+                "ffmpeg", "-v", "error",
+                "-ss", "00:00:01",
+                "-i", source,
+                "-frames:v", "1",
+                "-vf", "scale=320:-1",
+                "-f", "image2pipe", "-c:v", "mjpeg",
+                "pipe:1",
+            ],
+            timeout=THUMBNAIL_TIMEOUT_SECONDS,
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+        logger.warning("Failed to generate thumbnail: %s", e)
+        return b""
+    if result.returncode != 0:
+        logger.warning("Failed to generate thumbnail: %s", result.stderr.decode()[:500])
+        return b""
+    return result.stdout
+
+
+def _media_source(video_url: str) -> str:
+    """Presigned URL ffmpeg can read a stored video from, seeking with range requests."""
+    return get_presigned_url(_extract_minio_object_name(video_url), expires=MEDIA_URL_TTL)
+
+
+def _hash_stored_video(video_url: str) -> str:
+    return hash_chunks(iter_object_chunks(_extract_minio_object_name(video_url)))
+
+
+def _apply_media_info(video: Video, info: MediaInfo) -> None:
+    """Cache probed media facts on a Video row so later steps skip ffprobe."""
+    if info.duration:
+        video.duration = info.duration
+    video.width = info.width
+    video.height = info.height
+    video.codec = info.codec
+    video.fps = info.fps
+    video.has_audio = info.has_audio
+    video.keyframe_interval = info.keyframe_interval
+    video.media_json = info.to_json()
+
+
+async def _conform_video(video: Video, src: str, info: MediaInfo, aspect_ratio: str, work_dir: str) -> None:
+    """Store a mezzanine copy of a video next to the original."""
+    if conforms(info, aspect_ratio):
+        # Already in profile: the original doubles as the mezzanine
+        video.mezzanine_url = video.url
+        video.mezzanine_media_json = info.to_json()
+        video.mezzanine_hash = video.content_hash
+        return
+
+    out = os.path.join(work_dir, "mezzanine.mp4")
+    if not await render_mezzanine(src, out, info, aspect_ratio):
+        return
+    mezzanine_info = await probe_media(out)
+    if mezzanine_info is None:
+        return
+    video.mezzanine_url = await asyncio.to_thread(
+        upload_from_file,
+        out,
+        object_name=f"mezzanine/{video.user_id}/{uuid.uuid4().hex}.mp4",
+        content_type="video/mp4",
+    )
+    video.mezzanine_media_json = mezzanine_info.to_json()
+    video.mezzanine_hash = await asyncio.to_thread(hash_file, out)
+    logger.info("Video %s conformed to mezzanine profile", video.id)
+
+
+async def _store_previews(video: Video, src: str, info: MediaInfo, work_dir: str) -> None:
+    """Generate the gallery previews in one decode and upload them together."""
+    out_dir = os.path.join(work_dir, "previews")
+    os.makedirs(out_dir)
+    files = await generate_previews(src, info, out_dir)
+    if files is None:
+        return
+    prefix = f"previews/{video.user_id}/{uuid.uuid4().hex}"
+    uploads = [
+        (files.poster, "poster.jpg", "image/jpeg"),
+        (files.sprite, SPRITE_FILE, "image/jpeg"),
+        (files.sprite_vtt, VTT_FILE, "text/vtt"),
+        (files.preview, "preview.mp4", "video/mp4"),
+    ]
+    # The VTT refers to the sprite by name, so both share one prefix
+    video.poster_url, video.sprite_url, video.sprite_vtt_url, video.preview_url = await asyncio.gather(*(
+        asyncio.to_thread(upload_from_file, path, object_name=f"{prefix}/{name}", content_type=mime)
+        for path, name, mime in uploads
+    ))
+
+
+async def _ingest_video(video_id: str) -> None:
+    """Probe, hash and preview (or thumbnail) a stored video, and conform it if enabled.
+
+    ffmpeg and ffprobe read the video from MinIO over HTTP; the source is
+    never copied locally. Local disk under ``work_dir`` holds only outputs:
+    the preview artifacts (poster candidates, sprite, VTT, hover MP4) and a
+    mezzanine render, if enabled.
+    """
+    session = await _get_async_session()
+    work_dir = tempfile.mkdtemp()
+    try:
+        video = await session.get(Video, uuid.UUID(video_id), options=[undefer(Video.media_json)])
+        if video is None:
+            logger.error("Video %s not found", video_id)
+            return
+        job = None
+        if video.job_id is not None:
+            job = (await session.execute(select(Job).where(Job.id == video.job_id))).scalar_one_or_none()
+
+        src = await asyncio.to_thread(_media_source, video.url)
+
+        async def _no_value() -> None:
+            return None
+
+        probed, content_hash = await asyncio.gather(
+            probe_media(src) if video.media_json is None else _no_value(),
+            asyncio.to_thread(_hash_stored_video, video.url) if not video.content_hash else _no_value(),
+        )
+        if probed is not None:
+            _apply_media_info(video, probed)
+        info = MediaInfo.from_json(video.media_json) if video.media_json else None
+        if content_hash:
+            video.content_hash = content_hash
+
+        if settings.PREVIEWS_ENABLED and not video.poster_url and info is not None:
+            await _store_previews(video, src, info, work_dir)
+            if not video.thumbnail_url:
+                video.thumbnail_url = video.poster_url
+                if job is not None:
+                    job.thumbnail_url = video.thumbnail_url
+
+        if not video.thumbnail_url:
+            thumbnail_bytes = await _generate_thumbnail(src)
+            if thumbnail_bytes:
+                video.thumbnail_url = await asyncio.to_thread(
+                    upload_file,
+                    thumbnail_bytes,
+                    object_name=f"thumbnails/{video.user_id}/{uuid.uuid4().hex}.jpg",
+                    content_type="image/jpeg",
+                )
+                if job is not None:
+                    job.thumbnail_url = video.thumbnail_url
+        await session.commit()
+        if job is not None and video.thumbnail_url:
+            await _publish_job_update(
+                str(job.user_id), str(job.id), "completed",
+                progress=100, video_url=video.url, thumbnail_url=video.thumbnail_url,
+            )
+
+        if settings.MEZZANINE_ENABLED and not video.mezzanine_url and info is not None:
+            aspect_ratio = ((job.metadata_json if job else None) or {}).get("aspect_ratio", "16:9")
+            await _conform_video(video, src, info, aspect_ratio, work_dir)
+            await session.commit()
+
+        if settings.HLS_ENABLED and not video.hls_url and info is not None:
+            await asyncio.to_thread(package_video_hls.delay, video_id)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        await session.close()
+
+
+async def _release_scene(video_id: str) -> None:
+    """Count an ingested video's job as finished in its story run, if any."""
+    session = await _get_async_session()
+    try:
+        result = await session.execute(
+            select(Job).join(Video, Video.job_id == Job.id).where(Video.id == uuid.UUID(video_id))
+        )
+        job = result.scalar_one_or_none()
+        if job is not None:
+            await on_scene_finished(job, succeeded=True)
+    finally:
+        await session.close()
+
+
+@celery_app.task(name="app.tasks.media_tasks.ingest_video", bind=True, max_retries=2)
+def ingest_video(self, video_id: str) -> None:
+    """Celery task to ingest a completed video.
+
+    Story runs wait for this before merging; the scene counts as finished
+    either way, since the merge probes anything ingest left out.
+    """
+    try:
+        _run_async(_ingest_video(video_id))
+    except Exception as exc:
+        if self.request.retries < self.max_retries:
+            logger.warning("Ingesting video %s failed, retrying: %s", video_id, exc)
+            raise self.retry(exc=exc, countdown=10)
+        logger.exception("Ingesting video %s failed", video_id)
+    _run_async(_release_scene(video_id))
+
+
+async def _ensure_audio(video_path: str, output_path: str, info: MediaInfo) -> str:
+    """If video has no audio, add a silent audio track. Returns path to use."""
+    if info.has_audio:
+        return video_path
+    try:
+        duration = info.duration
+        result = await run_tool(
+            [
+                "ffmpeg",
+                "-i", video_path,
+                "-f", "lavfi",
+                "-i", f"anullsrc=channel_layout=stereo:sample_rate=44100",
+                "-t", str(duration),
+                "-c:v", "copy",
+                "-c:a", "aac",
+                "-shortest",
+                "-y",
+                output_path,
+            ],
+        )
+        if result.returncode == 0:
+            return output_path
+    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+        logger.warning("Failed to add silent audio: %s", e)
+    return video_path
+
+
+async def _merge_videos_with_transitions(
+    video_paths: Sequence[str],
+    media: Sequence[MediaInfo],
+    output_path: str,
+    fade_duration: float = 0.5,
+) -> bool:
+    """Merge videos with crossfade transitions using FFmpeg xfade filter.
+
+    ``video_paths`` may be files or URLs; ``media`` holds the probed facts
+    for each input, in the same order. URL inputs have to work all the way
+    into the concat fallback, which is why it whitelists network protocols.
+    """
+    if len(video_paths) == 0:
+        return False
+
+    if len(video_paths) == 1:
+        # Single video, just copy
+        return await run_ffmpeg(
+            ["ffmpeg", "-i", video_paths[0], "-c", "copy", "-y", output_path], "copy"
+        )
+
+    try:
+        # Ensure all videos have audio tracks for acrossfade compatibility
+        temp_dir = os.path.dirname(output_path)
+        prepared_paths: list[str] = []
+        durations: list[float] = []
+
+        for i, (path, info) in enumerate(zip(video_paths, media)):
+            audio_fixed = os.path.join(temp_dir, f"audio_fixed_{i:03d}.mp4")
+            prepared_paths.append(await _ensure_audio(path, audio_fixed, info))
+            durations.append(info.duration)
+
+        # Build xfade filter_complex for video
+        n = len(prepared_paths)
+        inputs = []
+        for p in prepared_paths:
+            inputs.extend(["-i", p])
+
+        # Build video xfade chain
+        video_filters: list[str] = []
+        audio_filters: list[str] = []
+
+        # Calculate offsets: each xfade happens at (cumulative_duration - fade_duration)
+        offsets: list[float] = []
+        cumulative = durations[0]
+        for i in range(1, n):
+            offset = max(0, cumulative - fade_duration)
+            offsets.append(offset)
+            cumulative = offset + durations[i]
+
+        # Video xfade chain
+        if n == 2:
+            video_filters.append(
+                f"[0:v][1:v]xfade=transition=fade:duration={fade_duration}:offset={offsets[0]}[vout]"
+            )
+            audio_filters.append(
+                f"[0:a][1:a]acrossfade=d={fade_duration}:c1=tri:c2=tri[aout]"
+            )
+        else:
+            # Chain: first pair
+            video_filters.append(
+                f"[0:v][1:v]xfade=transition=fade:duration={fade_duration}:offset={offsets[0]}[v1]"
+            )
+            audio_filters.append(
+                f"[0:a][1:a]acrossfade=d={fade_duration}:c1=tri:c2=tri[a1]"
+            )
+            # Subsequent pairs
+            for i in range(2, n):
+                prev_v = f"v{i - 1}"
+                prev_a = f"a{i - 1}"
+                out_v = "vout" if i == n - 1 else f"v{i}"
+                out_a = "aout" if i == n - 1 else f"a{i}"
+                video_filters.append(
+                    f"[{prev_v}][{i}:v]xfade=transition=fade:duration={fade_duration}:offset={offsets[i - 1]}[{out_v}]"
+                )
+                audio_filters.append(
+                    f"[{prev_a}][{i}:a]acrossfade=d={fade_duration}:c1=tri:c2=tri[{out_a}]"
+                )
+
+        filter_complex = ";".join(video_filters + audio_filters)
+
+        cmd = [
+            "ffmpeg",
+            *inputs,
+            "-filter_complex", filter_complex,
+            "-map", "[vout]",
+            "-map", "[aout]",
+            "-c:v", "libx264",
+            "-pix_fmt", "yuv420p",
+            "-preset", "fast",
+            "-crf", "23",
+            "-c:a", "aac",
+            "-b:a", "128k",
+            "-y",
+            output_path,
+        ]
+
+        if not await run_ffmpeg(cmd, "xfade merge"):
+            # Fallback to simple concat
+            return await _merge_videos_concat_fallback(video_paths, output_path)
+
+        return True
+
+    except IOError as e:
+        logger.error("Failed to merge videos with transitions: %s", e)
+        return await _merge_videos_concat_fallback(video_paths, output_path)
+
+
+async def _merge_videos_concat_fallback(video_paths: Sequence[str], output_path: str) -> bool:
+    """Fallback: merge videos using simple FFmpeg concat demuxer (no transitions).
+
+    Entries of a local concat list may only use file/crypto/data unless the
+    protocol whitelist is widened, and scene inputs are presigned URLs.
+    """
+    try:
+        concat_file = tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False)
+        for path in video_paths:
+            concat_file.write(f"file '{path}'\n")
+        concat_file.close()
+
+        success = await run_ffmpeg(
+            [
+                "ffmpeg",
+                "-f", "concat",
+                "-safe", "0",
+                "-protocol_whitelist", "file,http,https,tcp,tls,crypto",
+                "-i", concat_file.name,
+                "-c", "copy",
+                "-y",
+                output_path,
+            ],
+            "concat fallback",
+        )
+
+        os.unlink(concat_file.name)
+        return success
+    except IOError as e:
+        logger.error("Failed to merge videos (fallback): %s", e)
+        return False
+
+
+def _scene_video_fetcher(video_url: str) -> Callable[[], str]:
+    """Return a callable that presigns a stored video for ffmpeg on first use.
+
+    Merge pieces run on several threads; the lock makes them share one URL.
+    """
+    source: list[str] = []
+    lock = threading.Lock()
+
+    def fetch() -> str:
+        with lock:
+            if not source:
+                source.append(_media_source(video_url))
+            return source[0]
+    return fetch
+
+
+async def _merge_story_scenes(story_id: str) -> None:
+    """Merge all completed scene videos into a single video."""
+    session = await _get_async_session()
+    temp_dir = None
+
+    try:
+        # Get story and scenes
+        result = await session.execute(
+            select(Story).where(Story.id == uuid.UUID(story_id))
+        )
+        story = result.scalar_one_or_none()
+        if story is None:
+            logger.error("Story %s not found", story_id)
+            return
+
+        user_id_str = str(story.user_id)
+
+        # Update status to merging
+        story.merged_status = "merging"
+        story.updated_at = datetime.now(timezone.utc)
+        await session.commit()
+
+        # Get all completed scenes with videos (eager load to avoid greenlet error)
+        scenes_result = await session.execute(
+            select(Scene)
+            .join(Job, Scene.job_id == Job.id)
+            .join(Video, Job.id == Video.job_id)
+            .where(
+                Scene.story_id == story.id,
+                Job.status == "completed",
+                Video.url.isnot(None)
+            )
+            .options(
+                selectinload(Scene.job)
+                .selectinload(Job.video)
+                .options(undefer(Video.media_json), undefer(Video.mezzanine_media_json))
+            )
+            .order_by(Scene.order_index)
+        )
+        scenes = scenes_result.scalars().all()
+
+        if not scenes:
+            logger.warning("No completed scenes found for story %s", story_id)
+            story.merged_status = "failed"
+            story.updated_at = datetime.now(timezone.utc)
+            await session.commit()
+            return
+
+        # ffmpeg reads scene videos straight from MinIO, and only the ranges
+        # a merge step needs
+        temp_dir = tempfile.mkdtemp()
+        inputs: list[MergeInput] = []
+
+        for scene in scenes:
+            if not scene.job or not scene.job.video:
+                continue
+
+            video = scene.job.video
+
+            # Conformed copies share one profile, so smart_merge can stream-copy them
+            if video.mezzanine_url and video.mezzanine_media_json and video.mezzanine_hash:
+                inputs.append(MergeInput(
+                    info=MediaInfo.from_json(video.mezzanine_media_json),
+                    content_hash=video.mezzanine_hash,
+                    fetch=_scene_video_fetcher(video.mezzanine_url),
+                ))
+                continue
+
+            fetch = _scene_video_fetcher(video.url)
+
+            # Use the facts cached at ingest; older videos are probed and hashed once now
+            info = MediaInfo.from_json(video.media_json) if video.media_json else None
+            if info is None or not info.keyframes:
+                info = await probe_media(await asyncio.to_thread(fetch))
+                if info is None:
+                    logger.warning("Skipping unreadable scene video %s", video.id)
+                    continue
+                _apply_media_info(video, info)
+            if not video.content_hash:
+                video.content_hash = await asyncio.to_thread(_hash_stored_video, video.url)
+
+            inputs.append(MergeInput(info=info, content_hash=video.content_hash, fetch=fetch))
+        await session.commit()
+
+        # Stream-copy scene bodies and re-encode only the crossfade windows if
+        # possible, reusing pieces cached by earlier merges
+        output_path = os.path.join(temp_dir, "merged.mp4")
+        workers = settings.MERGE_WORKERS or os.cpu_count() or 1
+        cache = SegmentCache()
+        success = await smart_merge(inputs, output_path, fade=0.5, cache=cache, workers=workers)
+        if not success and len(inputs) > 1:
+            # Mismatched scenes: conform them in parallel chunks, then merge again
+            aspect_ratio = (scenes[0].job.metadata_json or {}).get("aspect_ratio", "16:9")
+            width, height = mezzanine_size(aspect_ratio)
+            conformed = await conform_scenes(
+                inputs, temp_dir, width, height,
+                workers=workers, chunk_seconds=settings.MERGE_CHUNK_SECONDS,
+            )
+            if conformed is not None:
+                success = await smart_merge(conformed, output_path, fade=0.5, cache=cache, workers=workers)
+        if not success:
+            success = await _merge_videos_with_transitions(
+                [await asyncio.to_thread(scene.fetch) for scene in inputs],
+                [scene.info for scene in inputs],
+                output_path,
+                fade_duration=0.5,
+            )
+
+        if not success:
+            story.merged_status = "failed"
+            story.updated_at = datetime.now(timezone.utc)
+            await session.commit()
+            return
+
+        # Upload merged video to MinIO
+        merged_object_name = f"merged_videos/{story.user_id}/{story_id}/{uuid.uuid4().hex}.mp4"
+        merged_url = await asyncio.to_thread(
+            upload_from_file,
+            output_path,
+            object_name=merged_object_name,
+            content_type="video/mp4",
+        )
+
+        # Update story
+        story.merged_video_url = merged_url
+        story.merged_hls_url = None
+        story.merged_status = "completed"
+        story.updated_at = datetime.now(timezone.utc)
+        await session.commit()
+
+        logger.info("Story %s merged successfully", story_id)
+        if settings.HLS_ENABLED:
+            await asyncio.to_thread(package_story_hls.delay, story_id, merged_url)
+
+    except Exception as exc:
+        logger.exception("Error merging story %s", story_id)
+        try:
+            story = await session.get(Story, uuid.UUID(story_id))
+            if story:
+                story.merged_status = "failed"
+                story.updated_at = datetime.now(timezone.utc)
+                await session.commit()
+        except Exception:
+            logger.exception("Failed to update story %s status after error", story_id)
+    finally:
+        # Clean up temp directory
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        await session.close()
+
+
+@celery_app.task(name="app.tasks.media_tasks.merge_story", bind=True, max_retries=1)
+def merge_story(self, story_id: str) -> None:
+    """Celery task to merge all scenes of a story into a single video."""
+    try:
+        _run_async(_merge_story_scenes(story_id))
+    except Exception as exc:
+        logger.exception("Celery merge task failed for story %s", story_id)
+        raise self.retry(exc=exc, countdown=10)
+
+
+async def _package_stored_video(video_url: str, info: MediaInfo | None, prefix: str) -> str | None:
+    """Package a stored MP4 as HLS under ``prefix`` and return the master playlist URL."""
+    source = await asyncio.to_thread(_media_source, video_url)
+    if info is None:
+        info = await probe_media(source)
+        if info is None:
+            return None
+
+    out_dir = tempfile.mkdtemp()
+    try:
+        if not await package_hls(source, info, out_dir):
+            return None
+        urls: dict[str, str] = {}
+        for name in sorted(os.listdir(out_dir)):
+            urls[name] = await asyncio.to_thread(
+                upload_from_file,
+                os.path.join(out_dir, name),
+                object_name=f"{prefix}/{name}",
+                content_type=content_type_for(name),
+            )
+        return urls[MASTER_PLAYLIST]
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+async def _package_video_hls(video_id: str) -> None:
+    session = await _get_async_session()
+    try:
+        video = await session.get(Video, uuid.UUID(video_id), options=[undefer(Video.media_json)])
+        if video is None or video.hls_url:
+            return
+        info = MediaInfo.from_json(video.media_json) if video.media_json else None
+        hls_url = await _package_stored_video(
+            video.url, info, f"hls/{video.user_id}/{uuid.uuid4().hex}"
+        )
+        if hls_url is not None:
+            video.hls_url = hls_url
+            await session.commit()
+            logger.info("Video %s packaged as HLS", video_id)
+    finally:
+        await session.close()
+
+
+async def _package_story_hls(story_id: str, merged_url: str) -> None:
+    session = await _get_async_session()
+    try:
+        story = await session.get(Story, uuid.UUID(story_id))
+        if story is None or story.merged_video_url != merged_url:
+            return
+        hls_url = await _package_stored_video(
+            merged_url, None, f"hls/{story.user_id}/{story_id}/{uuid.uuid4().hex}"
+        )
+        if hls_url is None:
+            return
+        # A re-merge may have replaced the video while this one was packaged
+        await session.refresh(story)
+        if story.merged_video_url == merged_url:
+            story.merged_hls_url = hls_url
+            await session.commit()
+            logger.info("Story %s packaged as HLS", story_id)
+    finally:
+        await session.close()
+
+
+@celery_app.task(name="app.tasks.media_tasks.package_video_hls", bind=True, max_retries=1)
+def package_video_hls(self, video_id: str) -> None:
+    """Celery task to package a video as an HLS ladder."""
+    try:
+        _run_async(_package_video_hls(video_id))
+    except Exception as exc:
+        logger.exception("HLS packaging failed for video %s", video_id)
+        raise self.retry(exc=exc, countdown=30)
+
+
+@celery_app.task(name="app.tasks.media_tasks.package_story_hls", bind=True, max_retries=1)
+def package_story_hls(self, story_id: str, merged_url: str) -> None:
+    """Celery task to package a merged story video as an HLS ladder."""
+    try:
+        _run_async(_package_story_hls(story_id, merged_url))
+    except Exception as exc:
+        logger.exception("HLS packaging failed for story %s", story_id)
+        raise self.retry(exc=exc, countdown=30)
@@ -0,0 +1,290 @@
+"""Poller process for in-flight provider jobs.
+
+Celery workers submit a job, register it with the poll scheduler and return.
+This process claims due jobs from Redis, polls their providers concurrently
+and hands finished jobs back to Celery (``finalize_generation``) for the
+download / upload / thumbnail step.
+
+Poll times adapt to how long each provider usually takes (``PollTiming``).
+ComfyUI jobs are mostly driven by pushed WebSocket events (see
+``ComfyUIEventListener``); their polls only serve as a safety net.
+
+Run with: python -m app.tasks.poller
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+
+import redis.asyncio as aioredis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_factory
+from app.models.job import Job
+from app.services.credentials import close_credentials
+from app.services.generation.base_provider import BaseVideoProvider, GenerationResult
+from app.services.generation.comfyui_events import ComfyUIEventListener
+from app.services.generation.factory import get_provider
+from app.services.generation.http_client import close_http_clients
+from app.services.generation.poll_scheduler import InFlightJob, PollScheduler
+from app.services.generation.poll_timing import PollTiming, is_rate_limited
+from app.services.generation.rate_limiter import close_rate_limiter
+from app.services.list_counts import close_list_counts
+from app.tasks.generation_tasks import (
+    _fail_generation,
+    _get_async_redis_client,
+    _get_user_api_key,
+    _publish_job_update,
+    close_job_updates,
+    finalize_generation,
+)
+from app.tasks.story_runner import close_story_runner, on_scene_finished
+
+logger = logging.getLogger(__name__)
+
+CLAIM_BATCH_SIZE = 500
+# Concurrent poll_jobs calls (one per provider instance) across a batch
+MAX_CONCURRENT_POLLS = 20
+IDLE_SLEEP_SECONDS = 1.0
+# Safety-net poll interval for ComfyUI jobs while the event socket is connected
+COMFYUI_FALLBACK_POLL_SECONDS = 60
+
+
+def _provider_key(job: InFlightJob) -> tuple[str, str]:
+    # ComfyUI is a single shared instance, so all users' jobs batch together
+    return (job.provider, "" if job.provider == "comfyui" else job.user_id)
+
+
+async def _resolve_providers(
+    session: AsyncSession, jobs: list[InFlightJob]
+) -> dict[tuple[str, str], BaseVideoProvider | Exception]:
+    """Build one provider instance per (provider, user) pair in the batch."""
+    providers: dict[tuple[str, str], BaseVideoProvider | Exception] = {}
+    for job in jobs:
+        key = _provider_key(job)
+        if key in providers:
+            continue
+        try:
+            api_key = ""
+            if job.provider != "comfyui":
+                api_key = await _get_user_api_key(session, uuid.UUID(job.user_id), job.provider)
+            providers[key] = get_provider(job.provider, api_key)
+        except Exception as exc:
+            providers[key] = exc
+    return providers
+
+
+async def _poll_group(
+    provider: BaseVideoProvider | Exception,
+    jobs: list[InFlightJob],
+    semaphore: asyncio.Semaphore,
+) -> dict[str, GenerationResult | Exception]:
+    """Refresh every job of one provider instance in a single poll_jobs call."""
+    if isinstance(provider, Exception):
+        return {job.job_id: provider for job in jobs}
+
+    async with semaphore:
+        try:
+            by_provider_id = await provider.poll_jobs([job.provider_job_id for job in jobs])
+        except Exception as exc:
+            return {job.job_id: exc for job in jobs}
+
+    return {
+        job.job_id: by_provider_id.get(job.provider_job_id)
+        or RuntimeError("No poll result returned")
+        for job in jobs
+    }
+
+
+def _pushes_events(job: InFlightJob, listener: ComfyUIEventListener | None) -> bool:
+    return job.provider == "comfyui" and listener is not None and listener.connected
+
+
+async def _next_poll_delay(
+    job: InFlightJob, timing: PollTiming, listener: ComfyUIEventListener | None
+) -> float:
+    if _pushes_events(job, listener):
+        # Completion arrives over the WebSocket; polling is only a safety net
+        return COMFYUI_FALLBACK_POLL_SECONDS
+    return await timing.next_delay(job)
+
+
+async def _drop_inactive(scheduler: PollScheduler, job: InFlightJob, db_job: Job | None) -> None:
+    """Stop tracking a job that was deleted, cancelled or finished elsewhere."""
+    if await scheduler.complete(job) and db_job is not None and db_job.status != "completed":
+        # A cancelled scene never reaches _fail_generation; advance its run here.
+        # Deleted jobs were already counted by the delete endpoint.
+        await on_scene_finished(db_job, succeeded=False)
+
+
+async def _poll_batch(
+    jobs: list[InFlightJob],
+    scheduler: PollScheduler,
+    timing: PollTiming,
+    semaphore: asyncio.Semaphore,
+    listener: ComfyUIEventListener | None,
+) -> None:
+    async with async_session_factory() as session:
+        result = await session.execute(
+            select(Job).where(Job.id.in_([uuid.UUID(j.job_id) for j in jobs]))
+        )
+        db_jobs = {str(j.id): j for j in result.scalars().all()}
+
+        # Drop jobs that were deleted or cancelled while in flight
+        active: list[InFlightJob] = []
+        for job in jobs:
+            db_job = db_jobs.get(job.job_id)
+            if db_job is None or db_job.status != "processing":
+                await _drop_inactive(scheduler, job, db_job)
+            else:
+                active.append(job)
+
+        now = time.time()
+        expired = [j for j in active if now > j.deadline]
+        active = [j for j in active if now <= j.deadline]
+        for job in expired:
+            if await scheduler.complete(job):
+                await _fail_generation(session, db_jobs[job.job_id], "Generation timed out after 10 minutes")
+                logger.error("Job %s timed out", job.job_id)
+
+        providers = await _resolve_providers(session, active)
+
+        groups: dict[tuple[str, str], list[InFlightJob]] = {}
+        for job in active:
+            groups.setdefault(_provider_key(job), []).append(job)
+
+        results: dict[str, GenerationResult | Exception] = {}
+        for group_results in await asyncio.gather(
+            *(_poll_group(providers[key], group, semaphore) for key, group in groups.items())
+        ):
+            results.update(group_results)
+
+        # One backoff step per rate-limited provider group, not per job
+        for key, group in groups.items():
+            error = results[group[0].job_id]
+            if isinstance(error, Exception) and is_rate_limited(error):
+                backoff = await timing.record_rate_limited(group[0], error)
+                logger.warning("%s rate limited polls, backing off %.0fs", key[0], backoff)
+
+        for job in active:
+            db_job = db_jobs[job.job_id]
+            gen_result = results[job.job_id]
+
+            if isinstance(gen_result, Exception):
+                # Transient provider/network error: try again on the next tick
+                logger.warning("Polling job %s failed: %s", job.job_id, gen_result)
+                await scheduler.reschedule(job.job_id, await _next_poll_delay(job, timing, listener))
+
+            elif gen_result.status == "completed" and gen_result.video_url:
+                if await scheduler.complete(job):
+                    await timing.record_completion(job)
+                    await asyncio.to_thread(finalize_generation.delay, job.job_id, gen_result.video_url)
+
+            elif gen_result.status == "failed":
+                if await scheduler.complete(job):
+                    await _fail_generation(session, db_job, gen_result.error or "Generation failed")
+                    logger.error("Job %s failed: %s", job.job_id, gen_result.error)
+
+            else:
+                # Progress pushed over the ComfyUI socket is more accurate than history polls
+                if db_job.progress != gen_result.progress and not _pushes_events(job, listener):
+                    db_job.progress = gen_result.progress
+                    db_job.updated_at = datetime.now(timezone.utc)
+                    await _publish_job_update(
+                        job.user_id, job.job_id, "processing",
+                        progress=gen_result.progress,
+                    )
+                await scheduler.reschedule(job.job_id, await _next_poll_delay(job, timing, listener))
+
+        await session.commit()
+
+
+def _build_comfyui_listener(
+    scheduler: PollScheduler, timing: PollTiming, redis_client: aioredis.Redis
+) -> ComfyUIEventListener:
+    """Route ComfyUI push events to the in-flight jobs they belong to."""
+
+    async def on_progress(prompt_id: str, progress: int) -> None:
+        job = await scheduler.find_by_provider_job("comfyui", prompt_id)
+        if job is None:
+            return
+        async with async_session_factory() as session:
+            db_job = await session.get(Job, uuid.UUID(job.job_id))
+            if db_job is None or db_job.status != "processing":
+                await _drop_inactive(scheduler, job, db_job)
+                return
+            if db_job.progress >= progress:
+                return
+            db_job.progress = progress
+            db_job.updated_at = datetime.now(timezone.utc)
+            await session.commit()
+        await _publish_job_update(job.user_id, job.job_id, "processing", progress=progress)
+
+    async def on_completed(prompt_id: str, video_url: str) -> None:
+        job = await scheduler.find_by_provider_job("comfyui", prompt_id)
+        if job is not None and await scheduler.complete(job):
+            await timing.record_completion(job)
+            await asyncio.to_thread(finalize_generation.delay, job.job_id, video_url)
+            logger.info("ComfyUI job %s finished (prompt %s)", job.job_id, prompt_id)
+
+    async def on_failed(prompt_id: str, error: str) -> None:
+        job = await scheduler.find_by_provider_job("comfyui", prompt_id)
+        if job is None or not await scheduler.complete(job):
+            return
+        async with async_session_factory() as session:
+            db_job = await session.get(Job, uuid.UUID(job.job_id))
+            if db_job is not None:
+                await _fail_generation(session, db_job, error)
+        logger.error("ComfyUI job %s failed: %s", job.job_id, error)
+
+    return ComfyUIEventListener(on_progress, on_completed, on_failed, redis_client)
+
+
+async def run_poller() -> None:
+    redis_client = _get_async_redis_client()
+    scheduler = PollScheduler(redis_client)
+    timing = PollTiming(redis_client)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+    logger.info("Poller started (%d jobs in flight)", await scheduler.in_flight_count())
+
+    listener: ComfyUIEventListener | None = None
+    listener_task: asyncio.Task | None = None
+    if settings.COMFYUI_EVENTS_ENABLED:
+        listener = _build_comfyui_listener(scheduler, timing, redis_client)
+        listener_task = asyncio.create_task(listener.run())
+
+    try:
+        while True:
+            jobs = await scheduler.claim_due(CLAIM_BATCH_SIZE)
+            if not jobs:
+                await asyncio.sleep(IDLE_SLEEP_SECONDS)
+                continue
+            try:
+                await _poll_batch(jobs, scheduler, timing, semaphore, listener)
+            except Exception:
+                # Claimed jobs become due again once their lease expires
+                logger.exception("Error polling batch of %d jobs", len(jobs))
+    finally:
+        if listener_task is not None:
+            listener_task.cancel()
+            await asyncio.gather(listener_task, return_exceptions=True)
+        await close_http_clients()
+        await close_rate_limiter()
+        await close_list_counts()
+        await close_credentials()
+        await close_story_runner()
+        await close_job_updates()
+        await redis_client.aclose()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    asyncio.run(run_poller())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Fan-out / fan-in execution of story scenes.
+
+A story run dispatches up to ``STORY_MAX_CONCURRENT_SCENES`` scene jobs and
+keeps the rest queued in Redis. Whenever a scene job finishes (completed or
+failed, from whichever worker or poller finalized it) ``on_scene_finished``
+releases the next queued scene, publishes aggregated story progress and,
+after the last scene, dispatches ``merge_story``.
+
+Coherent stories are registered without dispatching; their chained task
+drives the scenes, and the run only tracks progress and the final merge.
+"""
+
+import asyncio
+import json
+import logging
+
+import redis.asyncio as aioredis
+
+from app.config import settings
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+RUN_KEY_PREFIX = "story_run"
+# Runs abandoned mid-way (e.g. jobs deleted) expire instead of lingering
+RUN_TTL_SECONDS = 2 * 24 * 3600
+
+# KEYS: run hash, pending list, job set, finished set. ARGV: job_id, counter.
+# Counts each scene job once and pops the next pending scene, if any. A job
+# cancelled while still pending held no slot, so it frees none.
+_FINISH_SCRIPT = """
+if redis.call('SISMEMBER', KEYS[3], ARGV[1]) == 0 then
+    return nil
+end
+if redis.call('SADD', KEYS[4], ARGV[1]) == 0 then
+    return nil
+end
+redis.call('HINCRBY', KEYS[1], ARGV[2], 1)
+local state = redis.call('HMGET', KEYS[1], 'user_id', 'total', 'completed', 'failed')
+local next_job = false
+if redis.call('LREM', KEYS[2], 0, ARGV[1]) == 0 then
+    next_job = redis.call('LPOP', KEYS[2])
+end
+return {state[1], state[2], state[3], state[4], next_job}
+"""
+
+
+_redis: tuple[asyncio.AbstractEventLoop, aioredis.Redis] | None = None
+
+
+def _get_redis() -> aioredis.Redis:
+    global _redis
+    loop = asyncio.get_running_loop()
+    if _redis is None or _redis[0] is not loop:
+        _redis = (loop, aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True))
+    return _redis[1]
+
+
+async def close_story_runner() -> None:
+    global _redis
+    if _redis is not None and _redis[0] is asyncio.get_running_loop():
+        await _redis[1].aclose()
+        _redis = None
+
+
+def _run_keys(story_id: str) -> list[str]:
+    base = f"{RUN_KEY_PREFIX}:{story_id}"
+    return [base, f"{base}:pending", f"{base}:jobs", f"{base}:finished"]
+
+
+async def start_story_run(
+    story_id: str, user_id: str, scene_job_ids: list[str], dispatch: bool = True
+) -> None:
+    """Register a story run and, unless ``dispatch`` is False, start its first scenes.
+
+    Starting a new run for a story replaces any previous one; jobs of the old
+    run are no longer counted.
+    """
+    from app.tasks.generation_tasks import process_generation
+
+    cap = max(settings.STORY_MAX_CONCURRENT_SCENES, 1)
+    first, queued = (scene_job_ids[:cap], scene_job_ids[cap:]) if dispatch else ([], [])
+
+    run_key, pending_key, jobs_key, finished_key = keys = _run_keys(story_id)
+    async with _get_redis().pipeline(transaction=True) as pipe:
+        pipe.delete(*keys)
+        pipe.hset(run_key, mapping={
+            "user_id": user_id,
+            "total": len(scene_job_ids),
+            "completed": 0,
+            "failed": 0,
+        })
+        pipe.sadd(jobs_key, *scene_job_ids)
+        if queued:
+            pipe.rpush(pending_key, *queued)
+        for key in (run_key, pending_key, jobs_key):
+            pipe.expire(key, RUN_TTL_SECONDS)
+        await pipe.execute()
+
+    for job_id in first:
+        # Publishing to the broker blocks; keep it off the event loop
+        await asyncio.to_thread(process_generation.delay, job_id)
+
+
+async def on_scene_finished(job: Job, succeeded: bool) -> None:
+    """Advance the story run a finished scene job belongs to, if any.
+
+    Best-effort: errors are logged so they never fail the job itself.
+    """
+    story_id = (job.metadata_json or {}).get("story_id")
+    if not story_id:
+        return
+    try:
+        await _advance_run(story_id, str(job.id), succeeded)
+    except Exception:
+        logger.exception("Failed to advance story run %s after job %s", story_id, job.id)
+
+
+async def _advance_run(story_id: str, job_id: str, succeeded: bool) -> None:
+    from app.tasks.generation_tasks import process_generation
+    from app.tasks.media_tasks import merge_story
+
+    keys = _run_keys(story_id)
+    r = _get_redis()
+    result = await r.register_script(_FINISH_SCRIPT)(
+        keys=keys, args=[job_id, "completed" if succeeded else "failed"]
+    )
+    if result is None:
+        return
+
+    user_id, total, completed, failed, next_job_id = result
+    total, completed, failed = int(total), int(completed), int(failed)
+    await r.expire(keys[3], RUN_TTL_SECONDS)
+
+    if next_job_id:
+        await asyncio.to_thread(process_generation.delay, next_job_id)
+
+    finished = completed + failed
+    merging = finished >= total and completed > 0
+    await r.publish(f"job_updates:{user_id}", json.dumps({
+        "type": "story_progress",
+        "story_id": story_id,
+        "status": "merging" if merging else ("finished" if finished >= total else "generating"),
+        "progress": int(finished * 100 / total) if total else 100,
+        "completed": completed,
+        "failed": failed,
+        "total": total,
+    }))
+
+    if finished >= total:
+        await r.delete(*keys)
+        if merging:
+            await asyncio.to_thread(merge_story.delay, story_id)
+            logger.info("Story %s: all %d scenes finished, merge dispatched", story_id, total)
+        else:
+            logger.warning("Story %s: every scene failed, nothing to merge", story_id)
@@ -0,0 +1,166 @@
+"""Per-process async runtime for Celery workers.
+
+Each worker process owns one long-lived event loop, running in a background
+thread, and one pooled ``AsyncEngine``. Tasks hand coroutines to that loop
+through ``run_async`` so DB connections (and anything else bound to the loop)
+are reused across tasks instead of being rebuilt for every job.
+"""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any, TypeVar
+
+from celery.signals import (
+    celeryd_after_setup,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Pool size for a process that runs one task at a time (prefork, solo)
+SINGLE_TASK_POOL_SIZE = 2
+
+
+class WorkerRuntime:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._shutdown_hooks: list[Callable[[], Awaitable[None]]] = []
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread: threading.Thread | None = None
+        self.engine: AsyncEngine | None = None
+        self.session_factory: async_sessionmaker[AsyncSession] | None = None
+        # Tasks this process may run at once; set from the worker's pool settings
+        self.task_concurrency = 1
+
+    @property
+    def started(self) -> bool:
+        return self.loop is not None
+
+    def start(self) -> None:
+        with self._lock:
+            if self.loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=self._run_loop, args=(loop,), name="worker-event-loop", daemon=True
+            )
+            thread.start()
+
+            self.engine = create_async_engine(
+                settings.DATABASE_URL,
+                pool_size=self.pool_size(),
+                max_overflow=settings.WORKER_DB_MAX_OVERFLOW,
+                pool_pre_ping=True,
+            )
+            self.session_factory = async_sessionmaker(
+                self.engine, class_=AsyncSession, expire_on_commit=False
+            )
+            self.loop = loop
+            self.thread = thread
+            logger.info("Worker runtime started")
+
+    def pool_size(self) -> int:
+        """WORKER_DB_POOL_SIZE, or one connection per concurrent task if unset."""
+        if settings.WORKER_DB_POOL_SIZE > 0:
+            return settings.WORKER_DB_POOL_SIZE
+        return max(self.task_concurrency, SINGLE_TASK_POOL_SIZE)
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def reset(self) -> None:
+        """Forget state inherited from a parent process without touching it."""
+        with self._lock:
+            self.loop = None
+            self.thread = None
+            self.engine = None
+            self.session_factory = None
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the worker loop and block until it finishes."""
+        self.start()
+        assert self.loop is not None
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def add_shutdown_hook(self, hook: Callable[[], Awaitable[None]]) -> None:
+        self._shutdown_hooks.append(hook)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            loop, thread, engine = self.loop, self.thread, self.engine
+            if loop is None:
+                return
+
+            async def _close() -> None:
+                for hook in self._shutdown_hooks:
+                    try:
+                        await hook()
+                    except Exception:
+                        logger.exception("Worker runtime shutdown hook failed")
+                if engine is not None:
+                    await engine.dispose()
+
+            try:
+                asyncio.run_coroutine_threadsafe(_close(), loop).result(timeout=30)
+            except Exception:
+                logger.exception("Error disposing worker runtime resources")
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None:
+                thread.join(timeout=10)
+            loop.close()
+
+            self.loop = None
+            self.thread = None
+            self.engine = None
+            self.session_factory = None
+            logger.info("Worker runtime stopped")
+
+
+runtime = WorkerRuntime()
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    return runtime.run(coro)
+
+
+def get_session() -> AsyncSession:
+    runtime.start()
+    assert runtime.session_factory is not None
+    return runtime.session_factory()
+
+
+@celeryd_after_setup.connect
+def _on_worker_setup(sender: str, instance: Any, **kwargs: object) -> None:
+    # Runs before any task; only a thread pool runs several tasks per process
+    pool = getattr(instance.pool_cls, "__module__", str(instance.pool_cls))
+    if "thread" in pool:
+        runtime.task_concurrency = instance.concurrency
+
+
+@worker_process_init.connect
+def _on_worker_process_init(**kwargs: object) -> None:
+    # A forked child must not reuse the parent's loop thread or pooled sockets
+    runtime.reset()
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(**kwargs: object) -> None:
+    runtime.shutdown()
+
+
+@worker_shutdown.connect
+def _on_worker_shutdown(**kwargs: object) -> None:
+    # Non-prefork pools (solo/threads) never send worker_process_shutdown
+    runtime.shutdown()
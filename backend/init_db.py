@@ -5,13 +5,17 @@ import sys
 
 sys.path.insert(0, '/app')
 
-from app.database import async_engine
+from sqlalchemy import text
+
+from app.database import engine as async_engine
 from app.models import Base
 
 
 async def init_db():
     """Create all tables"""
     async with async_engine.begin() as conn:
+        # Trigram indexes on jobs / videos need the extension first
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
         print("Database tables created successfully!")
 
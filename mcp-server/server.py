@@ -238,24 +238,35 @@ def check_job(job_id: str) -> str:
 
 @mcp.tool()
 def list_jobs(
-    page: int = 1,
+    cursor: str | None = None,
     page_size: int = 20,
     status: str | None = None,
     job_type: str | None = None,
+    search: str | None = None,
 ) -> str:
-    """List generation jobs with optional filters.
+    """List generation jobs with optional filters, newest first, one page at a time.
+
+    The response's next_cursor is null on the last page; otherwise pass it
+    back as cursor to get the next page.
 
     Args:
-        page: Page number (default 1)
+        cursor: next_cursor from the previous page (omit for the first page)
         page_size: Items per page (1-100, default 20)
         status: Filter by status - queued, submitted, processing, completed, failed
         job_type: Filter by type - txt2vid, img2vid, vid2anime, story
+        search: Keywords matched against the original prompt, enhanced
+            prompt and style; results then come most relevant first, each
+            with a highlighted snippet
     """
-    params: dict = {"page": page, "page_size": page_size}
+    params: dict = {"page_size": page_size}
+    if cursor:
+        params["cursor"] = cursor
     if status:
         params["status"] = status
     if job_type:
         params["job_type"] = job_type
+    if search:
+        params["search"] = search
 
     with _client() as c:
         r = c.get("/jobs", headers=_headers(), params=params)
@@ -272,27 +283,31 @@ def list_jobs(
 def search_gallery(
     search: str | None = None,
     job_type: str | None = None,
-    page: int = 1,
+    cursor: str | None = None,
     page_size: int = 20,
-    sort_by: str = "created_at",
+    sort_by: str | None = None,
     sort_order: str = "desc",
 ) -> str:
-    """Search and browse generated videos in the gallery.
+    """Search and browse generated videos in the gallery, one page at a time.
+
+    The response's next_cursor is null on the last page; otherwise pass it
+    back as cursor, with the same filters and sort, to get the next page.
 
     Args:
-        search: Search keyword to filter by title
+        search: Keywords matched against titles and the original prompt,
+            enhanced prompt and style; matches carry a highlighted snippet
         job_type: Filter by type - txt2vid, img2vid, vid2anime, story
-        page: Page number (default 1)
+        cursor: next_cursor from the previous page (omit for the first page)
         page_size: Items per page (1-100, default 20)
-        sort_by: Sort field - created_at, title, file_size
+        sort_by: Sort field - relevance, created_at, title, file_size
+            (default relevance when searching, else created_at)
         sort_order: Sort direction - asc, desc
     """
-    params: dict = {
-        "page": page,
-        "page_size": page_size,
-        "sort_by": sort_by,
-        "sort_order": sort_order,
-    }
+    params: dict = {"page_size": page_size, "sort_order": sort_order}
+    if sort_by:
+        params["sort_by"] = sort_by
+    if cursor:
+        params["cursor"] = cursor
     if search:
         params["search"] = search
     if job_type:
@@ -380,10 +395,27 @@ def save_api_key(provider: str, api_key: str) -> str:
 
 
 @mcp.tool()
-def list_stories() -> str:
-    """List all stories for the current user."""
+def list_stories(
+    cursor: str | None = None,
+    limit: int = 20,
+    summary: bool = False,
+) -> str:
+    """List the current user's stories, newest first, one page at a time.
+
+    The response's next_cursor is null on the last page; otherwise pass it
+    back as cursor to get the next page.
+
+    Args:
+        cursor: next_cursor from the previous page (omit for the first page)
+        limit: Stories per page (1-100, default 20)
+        summary: Return scene counts and per-status counts instead of scenes
+    """
+    params: dict = {"limit": limit, "summary": summary}
+    if cursor:
+        params["cursor"] = cursor
+
     with _client() as c:
-        r = c.get("/stories", headers=_headers())
+        r = c.get("/stories", headers=_headers(), params=params)
         r.raise_for_status()
         return _fmt(r.json())
 